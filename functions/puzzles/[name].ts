@@ -0,0 +1,54 @@
+// GET /puzzles/:name — Serve the pre-compressed copy of a puzzle file
+// scripts/compress_puzzles.py writes .json.br / .json.gz next to each puzzle at
+// deploy time; send the best one the client accepts, else the plain file.
+// The copies only exist when Pages builds with `npm run build:pages` (see
+// README). Without them every puzzle request costs one extra asset fetch.
+
+// Content-Encoding -> file extension, in order of preference
+const ENCODINGS: [string, string][] = [
+  ['br', 'br'],
+  ['gzip', 'gz'],
+];
+
+function accepted(header: string | null): Set<string> {
+  const out = new Set<string>();
+  for (const part of (header || '').split(',')) {
+    const [name, ...params] = part.trim().toLowerCase().split(';');
+    if (name && !params.some((p) => p.trim() === 'q=0')) out.add(name);
+  }
+  return out;
+}
+
+export const onRequestGet: PagesFunction = async (context) => {
+  const { request, env, params } = context;
+  const name = String(params.name);
+  const encodings = accepted(request.headers.get('Accept-Encoding'));
+
+  if (name.endsWith('.json')) {
+    for (const [encoding, ext] of ENCODINGS) {
+      if (!encodings.has(encoding)) continue;
+      const url = new URL(request.url);
+      url.pathname += `.${ext}`;
+      const asset = await env.ASSETS.fetch(new Request(url, request));
+      // A missing copy falls through to the SPA's index.html, not a 404. Both
+      // copies are written together, so there is no point trying the next one.
+      if ((asset.headers.get('Content-Type') || '').startsWith('text/html')) break;
+      if (!asset.ok && asset.status !== 304) continue;
+
+      const headers = new Headers({ Vary: 'Accept-Encoding' });
+      const etag = asset.headers.get('ETag');
+      if (etag) headers.set('ETag', etag);
+      const cacheControl = asset.headers.get('Cache-Control');
+      if (cacheControl) headers.set('Cache-Control', cacheControl);
+      // If-None-Match matched this copy's ETag: the client's copy is current
+      if (asset.status === 304) return new Response(null, { status: 304, headers });
+
+      headers.set('Content-Type', 'application/json');
+      headers.set('Content-Encoding', encoding);
+      // The body is already compressed; stop the runtime from encoding it again
+      return new Response(asset.body, { headers, encodeBody: 'manual' });
+    }
+  }
+
+  return env.ASSETS.fetch(request);
+};
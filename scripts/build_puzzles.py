@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""Incremental, make-style build of the puzzle corpus.
+
+Each puzzle file in public/puzzles is a target built from four inputs:
+
+  market   chart windows + 52w range + company metadata (yfinance snapshot),
+           plus the hints computed by chart_analytics.py
+  llm      description, fun facts and difficulty (Gemini outputs)
+  version  generate_puzzles.GENERATOR_VERSION
+  format   serialization options (indent)
+
+Inputs are cached under scripts/.build/ and their fingerprints are recorded in
+scripts/.build/manifest.json. A target is rebuilt only when one of its input
+fingerprints changed or the file on disk no longer matches what was built, and
+it is written only when the new bytes differ from what is already there — so
+git diffs and Pages deploys contain real changes only.
+
+When a cached input is missing it is seeded from the existing puzzle file, so
+a fresh checkout can be built fully offline. The cache is only trusted while
+the file on disk is still the one recorded in the manifest: if another tool
+rewrote it since (regen_description.py, leak_check.py --fix, a generator
+rerun), the file is newer than the cache and the inputs are re-seeded from
+it instead of overwriting the edit. Rebuilt files keep the key order and the
+raw-UTF-8 vs escaped text of the file they replace. --refresh-llm never
+falls back to placeholder text for an existing puzzle: if Gemini fails
+(no key, rate limit) the target fails and its file and cache are kept.
+
+Usage:
+  python3 scripts/build_puzzles.py                     # Rebuild stale targets for the whole corpus
+  python3 scripts/build_puzzles.py MSFT AMZN           # Build specific tickers (fetched if new)
+  python3 scripts/build_puzzles.py --dry-run           # List what would be rebuilt and why
+  python3 scripts/build_puzzles.py --refresh-market    # Re-fetch chart data (batched bulk downloads) and rebuild
+  python3 scripts/build_puzzles.py --refresh-llm IBM   # Re-run Gemini for IBM before building
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from generate_puzzles import (
+    ANALYTICS_KEYS,
+    FORMAT_OPTIONS,
+    GENERATOR_VERSION,
+    OUTPUT_DIR,
+    SafeJSONEncoder,
+    assemble_puzzle,
+    fetch_market_snapshot,
+    fetch_ticker_metadata,
+    fingerprint,
+    generate_llm_outputs,
+    puzzle_def_from_inputs,
+    serialize_puzzle,
+    write_if_changed,
+)
+from build_ticker_index import write_ticker_index
+from bulk_download import BATCH_SIZE, fetch_market_snapshots
+from chart_analytics import analytics_for
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BUILD_DIR = os.path.join(SCRIPT_DIR, ".build")
+MARKET_DIR = os.path.join(BUILD_DIR, "market")
+LLM_DIR = os.path.join(BUILD_DIR, "llm")
+MANIFEST_PATH = os.path.join(BUILD_DIR, "manifest.json")
+
+# Metadata fields stored with the market snapshot
+META_KEYS = ("name", "sector", "industry", "marketCapRange", "hqCountry", "ipoYear")
+
+DEFAULT_JOBS = 4
+
+
+def load_json(path, default=None):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+
+def save_cache(path, data):
+    """Write a cached input, skipping the write if it is unchanged."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    encoded = json.dumps(data, indent=1, cls=SafeJSONEncoder).encode()
+    write_if_changed(path, encoded)
+
+
+def follow_key_order(new, old):
+    """Order `new` like `old`: shared keys keep their old position, new keys go last."""
+    ordered = {k: new[k] for k in old if k in new}
+    ordered.update(new)
+    return ordered
+
+
+def target_path(puzzle_id):
+    return os.path.join(OUTPUT_DIR, f"{puzzle_id}.json")
+
+
+def list_corpus_ids():
+    return sorted(
+        name[:-len(".json")]
+        for name in os.listdir(OUTPUT_DIR)
+        if name.endswith(".json")
+    )
+
+
+def market_from_puzzle(puzzle):
+    """Seed a market snapshot from an already-built puzzle file."""
+    hints = puzzle.get("hints", {})
+    meta = {"name": puzzle["answer"]["name"]}
+    for key in META_KEYS[1:]:
+        if key in hints:
+            meta[key] = hints[key]
+    market = {
+        "ticker": puzzle["answer"]["ticker"],
+        "meta": meta,
+        "charts": puzzle.get("charts", {}),
+        "basePrices": puzzle.get("basePrices", {}),
+        "high52w": hints.get("high52w", 0),
+        "low52w": hints.get("low52w", 0),
+    }
+    if "chartFormats" in puzzle:
+        market["chartFormats"] = puzzle["chartFormats"]
+    analytics = {k: hints[k] for k in ANALYTICS_KEYS if k in hints}
+    if analytics:
+        market["analytics"] = analytics
+    return market
+
+
+def llm_from_puzzle(puzzle):
+    """Seed LLM outputs from an already-built puzzle file."""
+    hints = puzzle.get("hints", {})
+    llm = {"description": hints.get("description", "")}
+    for key in ("funFact1", "funFact2"):
+        if key in hints:
+            llm[key] = hints[key]
+    llm["difficulty"] = puzzle.get("difficulty")
+    return llm
+
+
+def fetch_market(ticker):
+    meta = fetch_ticker_metadata(ticker)
+    market = fetch_market_snapshot(ticker)
+    market["ticker"] = ticker
+    market["meta"] = meta
+    # Fresh charts invalidate the old analytics hints; recompute rather than drop them
+    market["analytics"] = analytics_for({ticker: market["charts"].get("1y", [])})[ticker]
+    return market
+
+
+class Target:
+    """One puzzle file plus the state of its inputs."""
+
+    def __init__(self, puzzle_id, ticker=None):
+        self.id = puzzle_id
+        self.path = target_path(puzzle_id)
+        self.ticker = ticker or puzzle_id.upper()
+        self.market_path = os.path.join(MARKET_DIR, f"{puzzle_id}.json")
+        self.llm_path = os.path.join(LLM_DIR, f"{puzzle_id}.json")
+        self.existing = None
+        self.existing_digest = None
+        self.existing_ascii = True
+        self.reseeded = False
+        self.market = None
+        self.llm = None
+        self.reasons = []
+        self.error = None
+
+    def read_existing(self):
+        """Load the current puzzle file (if any) and take the ticker from it."""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        self.existing = json.loads(data)
+        self.existing_digest = fingerprint(data)
+        self.existing_ascii = data.isascii()
+        self.ticker = self.existing["answer"]["ticker"]
+
+    def load_inputs(self, recorded=None, refresh_market=False, refresh_llm=False, dry_run=False,
+                    fresh_market=None):
+        """Load cached inputs, seeding from the puzzle file or fetching when needed.
+
+        `recorded` is this target's manifest entry. When the file on disk is
+        not the recorded output it was edited after the last build, so the
+        cache is ignored and the inputs are re-seeded from the file.
+        `fresh_market` is a snapshot already fetched in bulk for this ticker;
+        it replaces the cached chart data while keeping the known metadata.
+        """
+        existing = self.existing
+        self.reseeded = (
+            existing is not None
+            and recorded is not None
+            and recorded.get("output") != self.existing_digest
+        )
+        cached = None if self.reseeded else load_json(self.market_path)
+
+        self.market = None if refresh_market else cached
+        if self.market is None:
+            if existing and not refresh_market:
+                self.market = market_from_puzzle(existing)
+            elif dry_run:
+                self.reasons.append("market data would be fetched")
+                self.market = market_from_puzzle(existing) if existing else None
+            elif fresh_market is not None:
+                if cached:
+                    meta = cached["meta"]
+                elif existing:
+                    meta = market_from_puzzle(existing)["meta"]
+                else:
+                    meta = fetch_ticker_metadata(self.ticker)
+                self.market = dict(fresh_market, ticker=self.ticker, meta=meta)
+            else:
+                self.market = fetch_market(self.ticker)
+            if self.market is not None and not dry_run:
+                save_cache(self.market_path, self.market)
+
+        cached = None if self.reseeded else load_json(self.llm_path)
+        self.llm = None if refresh_llm else cached
+        if self.llm is None:
+            if existing and not refresh_llm:
+                self.llm = llm_from_puzzle(existing)
+            elif dry_run:
+                self.reasons.append("LLM outputs would be regenerated")
+                self.llm = llm_from_puzzle(existing) if existing else None
+            else:
+                # Refreshing must not swap good outputs for the fallback text:
+                # a Gemini failure fails the target and keeps the file as is
+                previous = cached or existing
+                self.llm = generate_llm_outputs(self.ticker, self.market["meta"], strict=previous is not None)
+            if self.llm is not None and not dry_run:
+                save_cache(self.llm_path, self.llm)
+
+    def effective_options(self, options):
+        """Files saved with raw UTF-8 text (hand edits) stay that way."""
+        if self.existing_ascii:
+            return options
+        return dict(options, ensure_ascii=False)
+
+    def fingerprints(self, options):
+        options = self.effective_options(options)
+        return {
+            "market": fingerprint(self.market),
+            "llm": fingerprint(self.llm),
+            "version": GENERATOR_VERSION,
+            "format": fingerprint(options),
+        }
+
+    def check(self, recorded, options):
+        """Append the reasons this target is stale (none means up to date)."""
+        if self.market is None or self.llm is None:
+            return
+        if not os.path.exists(self.path):
+            self.reasons.append("output missing")
+            return
+        if recorded is None:
+            self.reasons.append("no recorded build")
+            return
+        if self.reseeded:
+            self.reasons.append("output modified on disk, inputs re-seeded from it")
+            return
+        current = self.fingerprints(options)
+        labels = {
+            "market": "market data changed",
+            "llm": "LLM outputs changed",
+            "version": "generator version changed",
+            "format": "format options changed",
+        }
+        for key, label in labels.items():
+            if recorded["inputs"].get(key) != current[key]:
+                self.reasons.append(label)
+
+    def build(self, options):
+        """Assemble and write the puzzle. Returns (written, manifest entry)."""
+        puzzle_def = puzzle_def_from_inputs(self.id, self.ticker, self.market["meta"], self.llm)
+        puzzle = assemble_puzzle(puzzle_def, self.market)
+        if self.existing:
+            # Hand-edited puzzles have their own key order; don't churn it
+            puzzle["hints"] = follow_key_order(puzzle["hints"], self.existing.get("hints", {}))
+            puzzle = follow_key_order(puzzle, self.existing)
+        data = serialize_puzzle(puzzle, self.effective_options(options))
+        written = write_if_changed(self.path, data)
+        entry = {"inputs": self.fingerprints(options), "output": fingerprint(data)}
+        return written, entry
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally rebuild canDLE puzzle files.")
+    parser.add_argument("tickers", nargs="*", help="tickers to build (default: every puzzle in the corpus)")
+    parser.add_argument("--dry-run", action="store_true", help="list stale targets and why, without building")
+    parser.add_argument("--refresh-market", action="store_true", help="re-fetch market data for the selected targets")
+    parser.add_argument("--refresh-llm", action="store_true", help="regenerate LLM outputs for the selected targets")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help=f"tickers per bulk download (default {BATCH_SIZE})")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help=f"parallel workers (default {DEFAULT_JOBS})")
+    parser.add_argument("--indent", type=int, default=FORMAT_OPTIONS["indent"], help="JSON indent for puzzle files")
+    args = parser.parse_args()
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    options = dict(FORMAT_OPTIONS, indent=args.indent)
+    manifest = load_json(MANIFEST_PATH, {})
+
+    if args.tickers:
+        targets = [Target(t.lower(), t.upper()) for t in args.tickers]
+    else:
+        targets = [Target(puzzle_id) for puzzle_id in list_corpus_ids()]
+
+    start = time.time()
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        list(pool.map(Target.read_existing, targets))
+
+    fresh = {}
+    if args.refresh_market and not args.dry_run:
+        # Batched yf.download calls; yfinance still requests each ticker, but threaded
+        fresh, _ = fetch_market_snapshots(sorted({t.ticker for t in targets}), args.batch_size)
+        for ticker, hints in analytics_for({t: s["charts"].get("1y", []) for t, s in fresh.items()}).items():
+            fresh[ticker]["analytics"] = hints
+
+    def prepare(target):
+        try:
+            recorded = manifest.get(target.id)
+            target.load_inputs(recorded, args.refresh_market, args.refresh_llm, args.dry_run,
+                               fresh.get(target.ticker))
+            target.check(recorded, options)
+        except Exception as e:
+            target.error = e
+        return target
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        targets = list(pool.map(prepare, targets))
+
+    failed = [t for t in targets if t.error]
+    stale = [t for t in targets if t.reasons and not t.error]
+
+    if args.dry_run:
+        for t in stale:
+            print(f"{t.id:<10}{', '.join(t.reasons)}")
+        for t in failed:
+            print(f"{t.id:<10}ERROR: {t.error}")
+        print(f"\n{len(stale)} of {len(targets)} targets would be rebuilt")
+        return
+
+    def build(target):
+        try:
+            return target, target.build(options)
+        except Exception as e:
+            target.error = e
+            return target, None
+
+    written = 0
+    rebuilt = 0
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        for target, result in pool.map(build, stale):
+            if result is None:
+                failed.append(target)
+                continue
+            did_write, entry = result
+            manifest[target.id] = entry
+            rebuilt += 1
+            if did_write:
+                written += 1
+                print(f"  Wrote {target.path} ({', '.join(target.reasons)})")
+
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    save_cache(MANIFEST_PATH, dict(sorted(manifest.items())))
+
+    if written and write_ticker_index():
+        print("  Updated ticker index")
+
+    elapsed = time.time() - start
+    up_to_date = len(targets) - len(stale) - sum(1 for t in failed if not t.reasons)
+    print(f"\n{len(targets)} targets: {up_to_date} up to date, "
+          f"{rebuilt} rebuilt ({written} written, {rebuilt - written} unchanged), "
+          f"{len(failed)} failed in {elapsed:.1f}s")
+    for t in failed:
+        print(f"  ERROR {t.id}: {t.error}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
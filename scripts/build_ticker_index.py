@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Generate the guess-autocomplete index used by GuessInput.
+
+Combines the S&P 500 list, every answer in the puzzle corpus and the
+hand-maintained extras in src/data/tickers.json into src/data/tickerIndex.json:
+
+  tickers  display tickers, sorted (entry i)
+  names    display names, parallel to tickers
+  keys     sorted search keys: lowercased tickers and normalized name tokens
+  refs     entry index for each key
+  buckets  first character -> [start, end) range of keys
+
+Any prefix query is a binary search inside one bucket, giving a contiguous
+range of keys — O(log n) per keystroke instead of scanning every entry.
+See src/lib/tickerIndex.ts for the client side.
+
+The generators call write_ticker_index() after writing puzzles, so the index
+stays in sync with the corpus.
+
+Usage:
+  python3 scripts/build_ticker_index.py           # Rebuild the index
+  python3 scripts/build_ticker_index.py --bench   # Compare against the linear scan
+"""
+
+import argparse
+import bisect
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from generate_puzzles import read_puzzle_head, write_if_changed
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+SP500_PATH = os.path.join(SCRIPT_DIR, "sp500_tickers.json")
+PUZZLES_DIR = os.path.join(REPO_ROOT, "public", "puzzles")
+EXTRAS_PATH = os.path.join(REPO_ROOT, "src", "data", "tickers.json")
+INDEX_PATH = os.path.join(REPO_ROOT, "src", "data", "tickerIndex.json")
+
+INDEX_VERSION = 1
+
+
+def load_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return text.lower()
+
+
+def name_tokens(name: str) -> list[str]:
+    return re.findall(r"[a-z0-9]+", normalize(name))
+
+
+def canonical(ticker: str) -> str:
+    """Share-class tickers appear as both BRK.B and BRK-B; treat them as one."""
+    return ticker.upper().replace(".", "-")
+
+
+def ticker_keys(ticker: str) -> set[str]:
+    key = canonical(ticker).lower()
+    return {key, re.sub(r"[^a-z0-9]", "", key)}
+
+
+def collect_entries() -> dict:
+    """{canonical ticker: {"ticker", "name", "aliases"}} from every source."""
+    entries = {}
+
+    def add(ticker, name):
+        key = canonical(ticker)
+        entry = entries.setdefault(key, {"ticker": ticker, "name": name, "aliases": set()})
+        entry["aliases"].add(name)
+
+    for company in load_json(SP500_PATH):
+        add(company["ticker"], company["name"])
+    for name in sorted(os.listdir(PUZZLES_DIR)):
+        if name.endswith(".json"):
+            answer = read_puzzle_head(os.path.join(PUZZLES_DIR, name))["answer"]
+            add(answer["ticker"], answer["name"])
+    # Hand-maintained extras (non-S&P guesses); never override the sources above
+    for company in load_json(EXTRAS_PATH):
+        add(company["ticker"], company["name"])
+    return entries
+
+
+def build_index(entries: dict) -> dict:
+    ordered = sorted(entries.values(), key=lambda e: e["ticker"])
+    pairs = set()
+    for i, entry in enumerate(ordered):
+        for key in ticker_keys(entry["ticker"]):
+            pairs.add((key, i))
+        for alias in entry["aliases"]:
+            for token in name_tokens(alias):
+                pairs.add((token, i))
+    pairs = sorted(pairs)
+
+    buckets = {}
+    for pos, (key, _) in enumerate(pairs):
+        start, _ = buckets.get(key[0], (pos, pos))
+        buckets[key[0]] = [start, pos + 1]
+
+    return {
+        "version": INDEX_VERSION,
+        "tickers": [e["ticker"] for e in ordered],
+        "names": [e["name"] for e in ordered],
+        "keys": [k for k, _ in pairs],
+        "refs": [i for _, i in pairs],
+        "buckets": buckets,
+    }
+
+
+def write_ticker_index() -> bool:
+    """Regenerate src/data/tickerIndex.json. Returns True if it changed."""
+    index = build_index(collect_entries())
+    data = json.dumps(index, separators=(",", ":")).encode() + b"\n"
+    return write_if_changed(INDEX_PATH, data)
+
+
+# --- Python ports of both lookups, for benchmarking -------------------------
+
+def search_linear(entries: list[dict], query: str, limit=8):
+    """The original GuessInput scan: substring match over every entry."""
+    q = query.lower()
+    return [e for e in entries if q in e["ticker"].lower() or q in e["name"].lower()][:limit]
+
+
+def prefix_range(index: dict, prefix: str) -> tuple[int, int]:
+    bucket = index["buckets"].get(prefix[:1])
+    if not bucket:
+        return 0, 0
+    lo, hi = bucket
+    keys = index["keys"]
+    start = bisect.bisect_left(keys, prefix, lo, hi)
+    end = bisect.bisect_left(keys, prefix + "\uffff", start, hi)
+    return start, end
+
+
+def search_index(index: dict, query: str, limit=8):
+    """Mirror of searchTickers() in src/lib/tickerIndex.ts."""
+    tokens = re.findall(r"[a-z0-9]+", normalize(query))
+    if not tokens:
+        return []
+    refs = index["refs"]
+    start, end = prefix_range(index, canonical(query.strip()).lower())
+    by_ticker = set(refs[start:end])
+    by_name = None
+    for token in tokens:
+        start, end = prefix_range(index, token)
+        matched = set(refs[start:end])
+        by_name = matched if by_name is None else by_name & matched
+    ranked = sorted(by_ticker) + sorted((by_name or set()) - by_ticker)
+    return [index["tickers"][i] for i in ranked[:limit]]
+
+
+def bench(index: dict, entries: dict):
+    flat = [{"ticker": e["ticker"], "name": e["name"]} for e in entries.values()]
+    queries = sorted({e["ticker"][:n].lower() for e in flat for n in (1, 2, 3)}
+                     | {e["name"][:n].lower() for e in flat for n in (3, 5)})
+
+    def run(fn):
+        start = time.perf_counter()
+        for q in queries:
+            fn(q)
+        return (time.perf_counter() - start) / len(queries) * 1e6
+
+    linear = run(lambda q: search_linear(flat, q))
+    indexed = run(lambda q: search_index(index, q))
+    print(f"{len(flat)} entries, {len(index['keys'])} keys, {len(queries)} queries")
+    print(f"  linear scan: {linear:8.1f} us/lookup")
+    print(f"  prefix index: {indexed:7.1f} us/lookup ({linear / indexed:.0f}x faster)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the guess-autocomplete ticker index.")
+    parser.add_argument("--bench", action="store_true", help="benchmark against the linear scan")
+    args = parser.parse_args()
+
+    entries = collect_entries()
+    index = build_index(entries)
+    if args.bench:
+        bench(index, entries)
+        return
+
+    written = write_ticker_index()
+    size = os.path.getsize(INDEX_PATH)
+    print(f"{'Wrote' if written else 'Unchanged'} {INDEX_PATH}: {len(index['tickers'])} tickers, "
+          f"{len(index['keys'])} keys, {size / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Batched market-data refresh using multi-ticker yfinance downloads.
+
+Instead of one `yf.Ticker(t).history(...)` call per ticker and window, each
+batch of tickers is fetched with a single `yf.download` per window and the
+wide result is split per ticker by column selection. Tickers that come back
+empty inside a batch fall back to the per-ticker fetch.
+
+Yahoo's chart endpoint is single-symbol, and `yf.download` still issues one
+`Ticker.history` request per ticker under the hood, so batching does not
+reduce HTTP volume. What it buys is yfinance's threaded fetching within a
+batch and less Python-side overhead per ticker. The report counts both the
+download calls and the chart requests behind them.
+
+Used by `build_puzzles.py --refresh-market`; run directly to check
+throughput without touching any files.
+
+Usage:
+  python3 scripts/bulk_download.py                    # Every ticker in the corpus
+  python3 scripts/bulk_download.py AAPL MSFT IBM      # Specific tickers
+  python3 scripts/bulk_download.py --batch-size 25
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+import yfinance as yf
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from generate_puzzles import (
+    CHART_PERIODS,
+    INTRADAY_FORMAT,
+    INTRADAY_PERIODS,
+    OUTPUT_DIR,
+    encode_daily,
+    encode_intraday,
+    fetch_market_snapshot,
+    high_low,
+)
+
+BATCH_SIZE = 50
+
+
+def download_batch(tickers: list[str], period: str, interval: str = "1d") -> dict:
+    """One bulk request for a batch of tickers. Returns {ticker: DataFrame}."""
+    wide = yf.download(
+        tickers,
+        period=period,
+        interval=interval,
+        group_by="ticker",
+        auto_adjust=True,
+        ignore_tz=False,
+        threads=True,
+        progress=False,
+    )
+    return split_by_ticker(wide, tickers)
+
+
+def split_by_ticker(wide, tickers: list[str]) -> dict:
+    """Split a wide (ticker, field) frame into one OHLC frame per ticker."""
+    empty = pd.DataFrame(columns=["Open", "High", "Low", "Close"])
+    if wide is None or wide.empty:
+        return {t: empty for t in tickers}
+    if not isinstance(wide.columns, pd.MultiIndex):
+        # Single-ticker downloads on older yfinance come back flat
+        return {tickers[0]: wide}
+
+    present = set(wide.columns.get_level_values(0))
+    return {
+        t: wide.xs(t, axis=1, level=0).dropna(how="all") if t in present else empty
+        for t in tickers
+    }
+
+
+def snapshot_batch(tickers: list[str]) -> tuple[dict, int]:
+    """Market snapshots for one batch. Returns ({ticker: snapshot}, yf.download calls)."""
+    snapshots = {
+        t: {"charts": {}, "basePrices": {}, "chartFormats": {}, "high52w": 0, "low52w": 0}
+        for t in tickers
+    }
+    calls = 0
+
+    for period_key, yf_period in CHART_PERIODS:
+        frames = download_batch(tickers, yf_period)
+        calls += 1
+        for t, hist in frames.items():
+            data, bp = encode_daily(hist)
+            snapshots[t]["charts"][period_key] = data
+            snapshots[t]["basePrices"][period_key] = round(bp, 2)
+            if period_key == "1y":
+                snapshots[t]["high52w"], snapshots[t]["low52w"] = high_low(hist.dropna(subset=["Close"]))
+
+    for period_key, yf_period, interval in INTRADAY_PERIODS:
+        frames = download_batch(tickers, yf_period, interval)
+        calls += 1
+        for t, hist in frames.items():
+            data, bp = encode_intraday(hist)
+            if data:
+                snapshots[t]["charts"][period_key] = data
+                snapshots[t]["basePrices"][period_key] = round(bp, 2)
+                snapshots[t]["chartFormats"][period_key] = INTRADAY_FORMAT
+
+    return snapshots, calls
+
+
+def fetch_market_snapshots(tickers: list[str], batch_size: int = BATCH_SIZE) -> tuple[dict, list]:
+    """Fetch market snapshots for many tickers in batches.
+
+    Returns ({ticker: snapshot}, [tickers that failed even the per-ticker fallback]).
+    """
+    tickers = [t.upper() for t in tickers]
+    batches = [tickers[i:i + batch_size] for i in range(0, len(tickers), batch_size)]
+    snapshots = {}
+    failed = []
+    total_calls = 0
+    total_requests = 0
+    start = time.time()
+    # Chart requests one ticker costs: one per window, plus the 52w lookup when fetched alone
+    per_ticker = len(CHART_PERIODS) + len(INTRADAY_PERIODS)
+
+    for i, batch in enumerate(batches):
+        batch_start = time.time()
+        try:
+            results, calls = snapshot_batch(batch)
+        except Exception as e:
+            print(f"  Batch {i+1}/{len(batches)} failed ({e}), falling back per ticker")
+            results, calls = {}, 0
+        # yf.download requests every ticker in the batch separately
+        requests_made = calls * len(batch)
+
+        fallbacks = [t for t in batch if not results.get(t, {}).get("charts", {}).get("1m")]
+        for t in fallbacks:
+            print(f"  {t}: missing from batch, fetching individually")
+            try:
+                results[t] = fetch_market_snapshot(t)
+                requests_made += per_ticker + 1
+            except Exception as e:
+                print(f"  ERROR fetching {t}: {e}")
+            if not results.get(t, {}).get("charts", {}).get("1m"):
+                results.pop(t, None)
+                failed.append(t)
+
+        snapshots.update(results)
+        total_calls += calls
+        total_requests += requests_made
+        elapsed = time.time() - batch_start
+        print(f"  Batch {i+1}/{len(batches)}: {len(batch)} tickers, {calls} download calls "
+              f"(~{requests_made} chart requests), {len(fallbacks)} fallbacks in {elapsed:.1f}s "
+              f"({len(batch) / max(elapsed, 1e-6):.1f} tickers/s)")
+
+    elapsed = time.time() - start
+    print(f"Fetched {len(snapshots)}/{len(tickers)} tickers with {total_calls} download calls "
+          f"(~{total_requests} chart requests) in {elapsed:.1f}s "
+          f"({len(tickers) / max(elapsed, 1e-6):.1f} tickers/s)")
+    return snapshots, failed
+
+
+def corpus_tickers() -> list[str]:
+    tickers = []
+    for name in sorted(os.listdir(OUTPUT_DIR)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(OUTPUT_DIR, name)) as f:
+            tickers.append(json.load(f)["answer"]["ticker"])
+    return sorted(set(tickers))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-fetch market data and report throughput.")
+    parser.add_argument("tickers", nargs="*", help="tickers to fetch (default: every puzzle in the corpus)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    tickers = args.tickers or corpus_tickers()
+    _, failed = fetch_market_snapshots(tickers, args.batch_size)
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""Market-derived hints for the whole corpus in one vectorized pass.
+
+Loads the 1y daily closes of every puzzle (straight from the chart arrays, no
+network) plus an index benchmark fetched once, aligns them into a single
+days x tickers NumPy matrix and computes, per ticker:
+
+  volatility1y    annualized realized volatility of daily log returns (%)
+  maxDrawdown1y   worst peak-to-trough decline of the close (%)
+  beta1y          beta of daily returns to the benchmark
+  correlation1y   correlation of daily returns to the benchmark
+  bestDay1y       largest one-day gain (%)
+  worstDay1y      largest one-day loss (%)
+
+The results are patched into each puzzle's hints (only the tail of the file
+is rewritten) and into the build cache, so build_puzzles.py keeps them. New
+market snapshots get the same hints through analytics_for():
+generate_from_ticker() (and so daily_generate.py) and
+build_puzzles.py --refresh-market recompute them for the fresh charts.
+
+The benchmark chart is cached in scripts/.build/benchmark_<TICKER>.json for
+a day. --benchmark-file reads a recorded chart instead (a list of
+[ts, open%, high%, low%, close%] rows, or a puzzle/cache file containing one),
+and --offline never touches the network, falling back to an equal-weighted
+index of the corpus when no recorded benchmark exists. --record-benchmark
+saves whichever benchmark was used as such a file.
+scripts/tests/fixtures/benchmark_1y.json is one, recorded offline from the
+corpus index.
+
+Usage:
+  python3 scripts/chart_analytics.py                      # Whole corpus, write hints
+  python3 scripts/chart_analytics.py --dry-run            # Print the table only
+  python3 scripts/chart_analytics.py AAPL IBM --dry-run
+  python3 scripts/chart_analytics.py --offline --benchmark-file scripts/tests/fixtures/benchmark_1y.json
+  python3 scripts/chart_analytics.py --dry-run --record-benchmark benchmark_spy_1y.json
+"""
+
+import argparse
+import functools
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from generate_puzzles import (
+    ANALYTICS_KEYS,
+    OUTPUT_DIR,
+    fetch_chart_data,
+    patch_puzzle_tail,
+    read_puzzle_chart,
+    read_puzzle_head,
+    read_puzzle_tail,
+)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BUILD_DIR = os.path.join(SCRIPT_DIR, ".build")
+MARKET_DIR = os.path.join(BUILD_DIR, "market")
+
+BENCHMARK = "SPY"
+TRADING_DAYS = 252
+
+# Cached benchmark charts older than this are re-fetched
+BENCHMARK_MAX_AGE = 86400
+
+# Tickers with fewer daily returns than this get no analytics hints
+MIN_OBSERVATIONS = 20
+
+# Decimal places per hint
+PRECISION = {
+    "volatility1y": 1,
+    "maxDrawdown1y": 1,
+    "beta1y": 2,
+    "correlation1y": 2,
+    "bestDay1y": 2,
+    "worstDay1y": 2,
+}
+
+
+def chart_closes(chart: list) -> tuple[np.ndarray, np.ndarray]:
+    """(day numbers, close levels relative to the first close) for a daily chart."""
+    if not chart:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    rows = np.asarray(chart, dtype=np.float64)
+    return rows[:, 0].astype(np.int64) // 86400, 1 + rows[:, 4] / 100
+
+
+def load_benchmark_file(path: str) -> list:
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("chart") or data.get("charts", {}).get("1y", [])
+    return data
+
+
+def load_benchmark(ticker: str, benchmark_file: str | None, offline: bool, refresh: bool) -> list | None:
+    """The benchmark's 1y chart: recorded file, then cache, then one fetch."""
+    if benchmark_file:
+        return load_benchmark_file(benchmark_file)
+
+    cache_path = os.path.join(BUILD_DIR, f"benchmark_{ticker}.json")
+    if os.path.exists(cache_path) and not refresh:
+        fresh = time.time() - os.path.getmtime(cache_path) < BENCHMARK_MAX_AGE
+        if fresh or offline:
+            return load_benchmark_file(cache_path)
+    if offline:
+        return None
+
+    chart, _ = fetch_chart_data(ticker, "1y")
+    if not chart:
+        return None
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    with open(cache_path, "w") as f:
+        json.dump({"ticker": ticker, "fetched": int(time.time()), "chart": chart}, f)
+    return chart
+
+
+@functools.lru_cache(maxsize=1)
+def default_benchmark() -> tuple:
+    """The default benchmark chart for the generators, fetched at most once per process.
+
+    Returns an empty chart when it can't be had; beta/correlation are then skipped.
+    """
+    try:
+        return tuple(map(tuple, load_benchmark(BENCHMARK, None, offline=False, refresh=False) or []))
+    except Exception as e:
+        print(f"  Benchmark {BENCHMARK} unavailable ({e}), skipping beta/correlation")
+        return ()
+
+
+def align(series: list[tuple[np.ndarray, np.ndarray]], days: np.ndarray) -> np.ndarray:
+    """Place each (days, closes) series into a len(days) x len(series) matrix, NaN where missing."""
+    matrix = np.full((len(days), len(series)), np.nan)
+    for j, (d, closes) in enumerate(series):
+        matrix[np.searchsorted(days, d), j] = closes
+    return matrix
+
+
+def forward_fill(matrix: np.ndarray) -> np.ndarray:
+    """Carry the last observation down each column (leading gaps stay NaN)."""
+    rows = np.where(np.isnan(matrix), 0, np.arange(len(matrix))[:, None])
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return matrix[rows, np.arange(matrix.shape[1])]
+
+
+def daily_returns(matrix: np.ndarray) -> np.ndarray:
+    """Close-to-close returns; a gap's move is attributed to the next observed day."""
+    filled = forward_fill(matrix)
+    returns = filled[1:] / filled[:-1] - 1
+    returns[np.isnan(matrix[1:])] = np.nan
+    return returns
+
+
+def compute_analytics(closes: np.ndarray, benchmark: np.ndarray) -> dict[str, np.ndarray]:
+    """Every analytics column for a days x tickers close matrix, one array per hint."""
+    returns = daily_returns(closes)
+    bench = daily_returns(benchmark[:, None])[:, 0]
+
+    filled = forward_fill(closes)
+    drawdown = filled / np.fmax.accumulate(filled, axis=0) - 1
+
+    # Beta/correlation over the days both the ticker and the benchmark traded
+    both = ~np.isnan(returns) & ~np.isnan(bench)[:, None]
+    n = both.sum(axis=0)
+    r = np.where(both, returns, 0)
+    b = np.where(both, bench[:, None], 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r_dev = np.where(both, r - r.sum(axis=0) / n, 0)
+        b_dev = np.where(both, b - b.sum(axis=0) / n, 0)
+        cov = (r_dev * b_dev).sum(axis=0)
+        var_b = (b_dev ** 2).sum(axis=0)
+        var_r = (r_dev ** 2).sum(axis=0)
+        enough = n >= MIN_OBSERVATIONS
+        beta = np.where(enough, cov / var_b, np.nan)
+        correlation = np.where(enough, cov / np.sqrt(var_b * var_r), np.nan)
+
+    observations = (~np.isnan(returns)).sum(axis=0)
+    valid = observations >= MIN_OBSERVATIONS
+    out = {key: np.full(closes.shape[1], np.nan) for key in ANALYTICS_KEYS}
+    if not valid.any():
+        # Reductions over an empty selection would raise; nothing is computable
+        return out
+    with np.errstate(invalid="ignore"):
+        columns = {
+            "volatility1y": np.nanstd(np.log1p(returns[:, valid]), axis=0, ddof=1) * np.sqrt(TRADING_DAYS) * 100,
+            "maxDrawdown1y": np.nanmin(drawdown[:, valid], axis=0) * 100,
+            "beta1y": beta[valid],
+            "correlation1y": correlation[valid],
+            "bestDay1y": np.nanmax(returns[:, valid], axis=0) * 100,
+            "worstDay1y": np.nanmin(returns[:, valid], axis=0) * 100,
+        }
+
+    for key in ANALYTICS_KEYS:
+        out[key][valid] = columns[key]
+    return out
+
+
+def hints_for(columns: dict[str, np.ndarray], j: int) -> dict:
+    """The hint values for ticker column j, skipping anything not computable."""
+    hints = {}
+    for key in ANALYTICS_KEYS:
+        value = columns[key][j]
+        if np.isfinite(value):
+            hints[key] = round(float(value), PRECISION[key])
+    return hints
+
+
+def analytics_for(charts: dict[str, list], benchmark_chart=None) -> dict[str, dict]:
+    """{key: analytics hints} for a few 1y daily charts, e.g. freshly fetched snapshots.
+
+    Each ticker's values depend only on its own chart and the benchmark, so
+    they match a corpus-wide run. Defaults to default_benchmark().
+    """
+    if benchmark_chart is None:
+        benchmark_chart = default_benchmark()
+    keys = list(charts)
+    series = [chart_closes(charts[k]) for k in keys]
+    bench_days, bench_closes = chart_closes(list(benchmark_chart))
+    days = np.unique(np.concatenate([bench_days, *(d for d, _ in series)]))
+    if not len(days):
+        # No chart and no benchmark (e.g. both fetches failed): nothing to compute
+        return {k: {} for k in keys}
+    closes = align(series, days)
+    benchmark = align([(bench_days, bench_closes)], days)[:, 0]
+    columns = compute_analytics(closes, benchmark)
+    return {k: hints_for(columns, j) for j, k in enumerate(keys)}
+
+
+def benchmark_chart(days: np.ndarray, benchmark: np.ndarray) -> list:
+    """Encode an aligned benchmark column as chart rows (close-only OHLC, % of the first close)."""
+    observed = ~np.isnan(benchmark)
+    levels = benchmark[observed] / benchmark[observed][0]
+    rows = []
+    for day, level in zip(days[observed], levels):
+        pct = round(float(level - 1) * 100, 2)
+        rows.append([int(day) * 86400, pct, pct, pct, pct])
+    return rows
+
+
+def update_market_cache(puzzle_id: str, hints: dict):
+    """Keep the build cache in step so build_puzzles.py does not drop the hints."""
+    path = os.path.join(MARKET_DIR, f"{puzzle_id}.json")
+    if not os.path.exists(path):
+        return
+    with open(path) as f:
+        market = json.load(f)
+    if market.get("analytics") == hints:
+        return
+    market["analytics"] = hints
+    with open(path, "w") as f:
+        json.dump(market, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute market-derived hints for the puzzle corpus.")
+    parser.add_argument("tickers", nargs="*", help="tickers to update (default: whole corpus)")
+    parser.add_argument("--benchmark", default=BENCHMARK, help=f"index benchmark ticker (default {BENCHMARK})")
+    parser.add_argument("--benchmark-file", help="recorded benchmark chart to use instead of fetching")
+    parser.add_argument("--refresh-benchmark", action="store_true", help="re-fetch the cached benchmark")
+    parser.add_argument("--offline", action="store_true", help="never fetch; use recorded data only")
+    parser.add_argument("--record-benchmark", metavar="PATH", help="save the benchmark used as a recorded chart file")
+    parser.add_argument("--dry-run", action="store_true", help="print the results without writing hints")
+    args = parser.parse_args()
+
+    if args.tickers:
+        names = [f"{t.lower()}.json" for t in args.tickers]
+    else:
+        names = sorted(n for n in os.listdir(OUTPUT_DIR) if n.endswith(".json"))
+
+    start = time.time()
+    paths = [os.path.join(OUTPUT_DIR, name) for name in names]
+    series = [chart_closes(read_puzzle_chart(path, "1y")) for path in paths]
+    loaded = time.time()
+
+    chart = load_benchmark(args.benchmark.upper(), args.benchmark_file, args.offline, args.refresh_benchmark)
+    bench_days, bench_closes = chart_closes(chart or [])
+    days = np.unique(np.concatenate([bench_days, *(d for d, _ in series)]))
+    closes = align(series, days)
+
+    if len(bench_days):
+        benchmark = align([(bench_days, bench_closes)], days)[:, 0]
+        label = args.benchmark_file or args.benchmark.upper()
+    else:
+        # Equal-weighted index of the corpus itself, chained from mean daily returns
+        mean_returns = np.nanmean(daily_returns(closes), axis=1)
+        benchmark = np.concatenate([[1.0], np.cumprod(1 + np.nan_to_num(mean_returns))])
+        label = "equal-weighted corpus index"
+    aligned = time.time()
+
+    if args.record_benchmark:
+        with open(args.record_benchmark, "w") as f:
+            json.dump({"ticker": label, "recorded": time.strftime("%Y-%m-%d"),
+                       "chart": benchmark_chart(days, benchmark)}, f, separators=(",", ":"))
+            f.write("\n")
+        print(f"Recorded benchmark to {args.record_benchmark}")
+
+    columns = compute_analytics(closes, benchmark)
+    computed = time.time()
+
+    print(f"{len(names)} tickers x {len(days)} days vs {label}")
+    print(f"  load {loaded - start:.2f}s, align {aligned - loaded:.2f}s, compute {(computed - aligned) * 1000:.1f}ms")
+
+    written = 0
+    skipped = []
+    for j, (name, path) in enumerate(zip(names, paths)):
+        hints = hints_for(columns, j)
+        ticker = read_puzzle_head(path)["answer"]["ticker"]
+        if not hints:
+            skipped.append(ticker)
+            continue
+        if args.dry_run:
+            print(f"  {ticker:<8}" + "  ".join(f"{k}={v}" for k, v in hints.items()))
+            continue
+        tail, offset = read_puzzle_tail(path)
+        tail.setdefault("hints", {}).update(hints)
+        if patch_puzzle_tail(path, tail, offset):
+            written += 1
+        update_market_cache(name[:-len(".json")], hints)
+
+    if skipped:
+        print(f"Not enough daily data (<{MIN_OBSERVATIONS} returns): {' '.join(skipped)}")
+    if not args.dry_run:
+        print(f"\nUpdated hints in {written}/{len(names)} puzzles in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
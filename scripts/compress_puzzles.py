@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Emit pre-compressed copies (.json.gz / .json.br) of every puzzle file.
+
+Puzzle files are the largest assets the site serves, so they are compressed
+once at build time at maximum levels instead of per request at the edge.
+Source hashes are recorded in scripts/.build/compressed.json and a puzzle is
+only recompressed when its JSON changes (or a compressed copy is missing).
+
+Brotli output needs the optional `brotli` package; without it only gzip
+copies are written.
+
+The copies are build output, not source: they are gitignored and produced
+at deploy time by `npm run build:pages`, which compresses dist/puzzles after
+`vite build`. functions/puzzles/[name].ts serves them with Content-Encoding
+to clients that accept it. The generators only write the JSON; nothing
+else compresses.
+
+Usage:
+  python3 scripts/compress_puzzles.py                       # Compress stale puzzles across the corpus
+  python3 scripts/compress_puzzles.py AAPL IBM              # Only these tickers
+  python3 scripts/compress_puzzles.py --force               # Recompress everything
+  python3 scripts/compress_puzzles.py --dir dist/puzzles    # Compress the deploy output
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PUZZLES_DIR = os.path.join(SCRIPT_DIR, "..", "public", "puzzles")
+MANIFEST_PATH = os.path.join(SCRIPT_DIR, ".build", "compressed.json")
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+def encodings():
+    """Compressed extensions this environment can produce."""
+    return ["gz", "br"] if brotli else ["gz"]
+
+
+def compress_bytes(data: bytes) -> dict:
+    """Return {extension: compressed bytes} at maximum compression."""
+    # mtime=0 keeps gzip output deterministic, so unchanged sources give unchanged bytes
+    out = {"gz": gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)}
+    if brotli:
+        out["br"] = brotli.compress(data, quality=BROTLI_QUALITY, mode=brotli.MODE_TEXT)
+    return out
+
+
+def compress_file(path: str) -> dict:
+    """Compress one puzzle file next to itself. Returns its manifest entry."""
+    with open(path, "rb") as f:
+        data = f.read()
+    entry = {"source": hashlib.sha256(data).hexdigest(), "size": len(data)}
+    for ext, blob in compress_bytes(data).items():
+        out_path = f"{path}.{ext}"
+        try:
+            with open(out_path, "rb") as f:
+                unchanged = f.read() == blob
+        except FileNotFoundError:
+            unchanged = False
+        if not unchanged:
+            with open(out_path, "wb") as f:
+                f.write(blob)
+        entry[ext] = len(blob)
+    return entry
+
+
+def is_fresh(path: str, digest: str, entry: dict | None) -> bool:
+    if not entry or entry.get("source") != digest:
+        return False
+    return all(ext in entry and os.path.exists(f"{path}.{ext}") for ext in encodings())
+
+
+def load_manifest() -> dict:
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(manifest: dict):
+    os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump(dict(sorted(manifest.items())), f, indent=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-compress canDLE puzzle files.")
+    parser.add_argument("tickers", nargs="*", help="tickers to compress (default: whole corpus)")
+    parser.add_argument("--force", action="store_true", help="recompress even if sources are unchanged")
+    parser.add_argument("--dir", default=PUZZLES_DIR, help="directory of puzzle files (default: public/puzzles)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("brotli not installed, writing gzip copies only (pip install brotli)")
+
+    if args.tickers:
+        names = [f"{t.lower()}.json" for t in args.tickers]
+    else:
+        names = sorted(n for n in os.listdir(args.dir) if n.endswith(".json"))
+
+    manifest = load_manifest()
+    stale = []
+    for name in names:
+        path = os.path.join(args.dir, name)
+        if not os.path.exists(path):
+            print(f"  ERROR: Puzzle file not found: {path}")
+            continue
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        if args.force or not is_fresh(path, digest, manifest.get(name)):
+            stale.append(name)
+
+    print(f"{len(stale)} of {len(names)} puzzles need compressing")
+
+    start = time.time()
+    paths = [os.path.join(args.dir, name) for name in stale]
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        for name, entry in zip(stale, pool.map(compress_file, paths)):
+            manifest[name] = entry
+    elapsed = time.time() - start
+    save_manifest(manifest)
+
+    totals = {"size": 0, **{ext: 0 for ext in encodings()}}
+    for name in names:
+        entry = manifest.get(name)
+        if not entry:
+            continue
+        for key in totals:
+            totals[key] += entry.get(key, 0)
+
+    print(f"\nCompressed {len(stale)} puzzles in {elapsed:.1f}s")
+    raw = totals["size"]
+    print(f"Corpus: {raw / 1e6:.1f} MB raw")
+    for ext in encodings():
+        if raw:
+            print(f"  .json.{ext}: {totals[ext] / 1e6:.1f} MB ({raw / max(totals[ext], 1):.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
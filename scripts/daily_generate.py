@@ -5,13 +5,21 @@ Picks a random S&P 500 ticker (no recent repeats), generates its puzzle
 (chart data from yfinance + Gemini description + difficulty rating),
 appends it to the schedule, and saves everything. GitHub Actions commits
 and pushes the changes, triggering a Cloudflare Pages redeploy.
+
+Generation is speculative: CANDIDATES_PER_DAY tickers are generated
+concurrently and each open date takes the first one that passes validation,
+so a slow or broken ticker never holds up the run. Healthy candidates that
+lose the race are written anyway and parked in scripts/prebuilt.json; later
+dates (in this run or the next) use them before generating anything new.
 """
 
 import json
+import math
 import os
 import random
 import sys
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 
 # Paths relative to repo root
@@ -19,10 +27,12 @@ REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SP500_PATH = os.path.join(REPO_ROOT, "scripts", "sp500_tickers.json")
 SCHEDULE_PATH = os.path.join(REPO_ROOT, "public", "schedule.json")
 PUZZLES_DIR = os.path.join(REPO_ROOT, "public", "puzzles")
+PREBUILT_PATH = os.path.join(REPO_ROOT, "scripts", "prebuilt.json")
 
 # Import the existing generation functions
 sys.path.insert(0, os.path.join(REPO_ROOT, "scripts"))
-from generate_puzzles import generate_from_ticker, SafeJSONEncoder
+from generate_puzzles import generate_from_ticker, write_puzzle, SafeJSONEncoder
+from build_ticker_index import write_ticker_index
 
 # Don't repeat any ticker used in the last 90 days
 LOOKBACK_DAYS = 90
@@ -30,6 +40,17 @@ LOOKBACK_DAYS = 90
 BUFFER_DAYS = 30
 # Max puzzles to generate per run (avoid long CI jobs / rate limits)
 MAX_PER_RUN = 3
+# Candidates generated concurrently; each date takes the first healthy one
+CANDIDATES_PER_DAY = 3
+# Give up on a date after this many failed candidates
+MAX_FAILURES_PER_DAY = 2 * CANDIDATES_PER_DAY
+# Parked puzzles older than this are discarded (their charts are stale)
+PREBUILT_MAX_AGE_DAYS = BUFFER_DAYS
+# How long to wait for unneeded candidates to finish (and be parked) before exiting
+STRAGGLER_GRACE_SECONDS = 30
+# Base prices outside this range mean the chart data is broken
+MIN_BASE_PRICE = 0.01
+MAX_BASE_PRICE = 1_000_000
 
 
 def load_json(path):
@@ -74,6 +95,55 @@ def pick_ticker(pool, recently_used):
     return random.choice(available)
 
 
+def validate_puzzle(puzzle):
+    """Raise ValueError unless the puzzle is fit to schedule."""
+    ticker = puzzle["answer"]["ticker"]
+    if not puzzle.get("charts", {}).get("1m"):
+        raise ValueError(f"No 1m chart data for {ticker}")
+    for period, price in puzzle.get("basePrices", {}).items():
+        if not (isinstance(price, (int, float)) and math.isfinite(price)
+                and MIN_BASE_PRICE <= price <= MAX_BASE_PRICE):
+            raise ValueError(f"Bad {period} base price for {ticker}: {price}")
+    if not puzzle.get("hints", {}).get("description"):
+        raise ValueError(f"No description for {ticker}")
+
+
+def build_candidate(ticker):
+    """Generate and validate one candidate puzzle (runs in a worker thread)."""
+    puzzle = generate_from_ticker(ticker)
+    validate_puzzle(puzzle)
+    return puzzle
+
+
+def save_puzzle(ticker, puzzle):
+    puzzle_path = os.path.join(PUZZLES_DIR, f"{ticker.lower()}.json")
+    write_puzzle(puzzle_path, puzzle)
+    print(f"Saved {puzzle_path}")
+
+
+def load_prebuilt():
+    """{ticker: build date} of parked puzzles, oldest first."""
+    try:
+        return load_json(PREBUILT_PATH)
+    except FileNotFoundError:
+        return {}
+
+
+def take_prebuilt(prebuilt, recently_used):
+    """Pop the oldest usable parked ticker, discarding stale or missing ones."""
+    cutoff = (datetime.now() - timedelta(days=PREBUILT_MAX_AGE_DAYS)).strftime("%Y-%m-%d")
+    for ticker, built in list(prebuilt.items()):
+        del prebuilt[ticker]
+        path = os.path.join(PUZZLES_DIR, f"{ticker.lower()}.json")
+        if built < cutoff or not os.path.exists(path):
+            print(f"Discarding stale pre-built puzzle: {ticker} (built {built})")
+            continue
+        if ticker.upper() in recently_used:
+            continue
+        return ticker
+    return None
+
+
 def prune_old_dates(schedule, keep_days_back=7):
     """Remove schedule entries more than `keep_days_back` days in the past."""
     cutoff = (datetime.now() - timedelta(days=keep_days_back)).strftime("%Y-%m-%d")
@@ -87,13 +157,9 @@ def generate_specific_ticker(ticker):
     print(f"Generating specific ticker: {ticker}")
 
     try:
-        puzzle = generate_from_ticker(ticker)
-        if not puzzle.get("charts", {}).get("1m"):
-            raise ValueError(f"No 1m chart data for {ticker}")
-
-        puzzle_path = os.path.join(PUZZLES_DIR, f"{ticker.lower()}.json")
-        save_json(puzzle_path, puzzle)
-        print(f"Saved {puzzle_path}")
+        puzzle = build_candidate(ticker)
+        save_puzzle(ticker, puzzle)
+        write_ticker_index()
         print("Done! (puzzle generated, not added to schedule)")
 
     except Exception as e:
@@ -129,58 +195,80 @@ def main():
     print(f"Days to add: {days_to_add}")
 
     recently_used = get_recently_used_tickers(schedule)
+    prebuilt = load_prebuilt()
     errors = []
     added = 0
+    parked = 0
+    run_start = time.time()
 
-    for i in range(days_to_add):
-        next_date = get_next_date(schedule)
-        selected = pick_ticker(pool, recently_used)
-        ticker = selected["ticker"]
+    # Candidates still generating: future -> ticker. Losers of one date's race
+    # keep running and are picked up by the next date (or parked at the end).
+    in_flight = {}
 
-        print(f"\n--- [{i+1}/{days_to_add}] Generating puzzle for {next_date}: {ticker} ---")
-
-        try:
-            puzzle = generate_from_ticker(ticker)
+    def taken():
+        return recently_used | set(prebuilt) | {t.upper() for t in in_flight.values()}
 
-            # Validate: must have chart data
-            if not puzzle.get("charts", {}).get("1m"):
-                raise ValueError(f"No 1m chart data for {ticker}")
+    def park(ticker, puzzle):
+        nonlocal parked
+        save_puzzle(ticker, puzzle)
+        prebuilt[ticker] = today
+        parked += 1
+        print(f"Parked {ticker} as a pre-built puzzle")
 
-            # Save puzzle JSON
-            puzzle_path = os.path.join(PUZZLES_DIR, f"{ticker.lower()}.json")
-            save_json(puzzle_path, puzzle)
-            print(f"Saved {puzzle_path}")
-
-            # Update schedule
-            schedule[next_date] = ticker
-            recently_used.add(ticker.upper())
-            added += 1
-
-        except Exception as e:
-            print(f"ERROR generating {ticker}: {e}")
-            errors.append(f"{ticker}: {e}")
+    executor = ThreadPoolExecutor(max_workers=CANDIDATES_PER_DAY)
+    for i in range(days_to_add):
+        next_date = get_next_date(schedule)
+        date_start = time.time()
+        print(f"\n--- [{i+1}/{days_to_add}] Puzzle for {next_date} ---")
+
+        ticker = take_prebuilt(prebuilt, recently_used)
+        if ticker:
+            print(f"Using pre-built puzzle: {ticker}")
+
+        failures = 0
+        while ticker is None and failures < MAX_FAILURES_PER_DAY:
+            while len(in_flight) < CANDIDATES_PER_DAY:
+                candidate = pick_ticker(pool, taken())["ticker"]
+                print(f"Starting candidate: {candidate}")
+                in_flight[executor.submit(build_candidate, candidate)] = candidate
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                candidate = in_flight.pop(future)
+                try:
+                    puzzle = future.result()
+                except Exception as e:
+                    print(f"ERROR generating {candidate}: {e}")
+                    errors.append(f"{candidate}: {e}")
+                    failures += 1
+                    continue
+                if ticker is None:
+                    ticker = candidate
+                    save_puzzle(ticker, puzzle)
+                else:
+                    park(candidate, puzzle)
+
+        if ticker is None:
+            print(f"Giving up on {next_date} after {failures} failed candidates")
+            continue
 
-            # Try one fallback ticker
+        schedule[next_date] = ticker
+        recently_used.add(ticker.upper())
+        added += 1
+        print(f"Scheduled {ticker} for {next_date} in {time.time() - date_start:.1f}s")
+
+    # Unneeded candidates that finish within the grace period become pre-built puzzles
+    executor.shutdown(wait=False, cancel_futures=True)
+    if in_flight:
+        done, _ = wait(in_flight, timeout=STRAGGLER_GRACE_SECONDS)
+        for future in done:
+            candidate = in_flight.pop(future)
             try:
-                fallback = pick_ticker(pool, recently_used | {ticker.upper()})
-                ticker = fallback["ticker"]
-                print(f"Retrying with fallback: {ticker}")
-                puzzle = generate_from_ticker(ticker)
-                if not puzzle.get("charts", {}).get("1m"):
-                    raise ValueError(f"No 1m chart data for {ticker}")
-                puzzle_path = os.path.join(PUZZLES_DIR, f"{ticker.lower()}.json")
-                save_json(puzzle_path, puzzle)
-                schedule[next_date] = ticker
-                recently_used.add(ticker.upper())
-                added += 1
-            except Exception as e2:
-                print(f"FALLBACK ALSO FAILED for {ticker}: {e2}")
-                errors.append(f"fallback {ticker}: {e2}")
-                continue
-
-        # Brief pause between generations to avoid rate limits
-        if i < days_to_add - 1:
-            time.sleep(2)
+                park(candidate, future.result())
+            except Exception as e:
+                print(f"Discarding candidate {candidate}: {e}")
+
+    print(f"\nGenerated {added} puzzle(s) in {time.time() - run_start:.1f}s")
 
     # 3. Prune old dates (keep 7 days of history)
     schedule = prune_old_dates(schedule)
@@ -188,20 +276,33 @@ def main():
     # 4. Sort schedule by date
     schedule = dict(sorted(schedule.items()))
 
-    # 5. Save updated schedule
+    # 5. Save updated schedule and the parked puzzles for future runs
     save_json(SCHEDULE_PATH, schedule)
-    print(f"\nSchedule updated: {len(schedule)} entries, {added} new puzzles added")
+    save_json(PREBUILT_PATH, prebuilt)
+
+    # 6. Keep guess autocomplete in sync with the corpus
+    write_ticker_index()
+    print(f"\nSchedule updated: {len(schedule)} entries, {added} new puzzles added, "
+          f"{len(prebuilt)} pre-built ({parked} parked this run)")
 
     if errors:
         print(f"\nWARNINGS: {len(errors)} errors occurred:")
         for e in errors:
             print(f"  - {e}")
 
+    exit_code = 0
     if added == 0:
         print("ERROR: No puzzles were generated!")
-        sys.exit(1)
-
-    print("\nDone!")
+        exit_code = 1
+    else:
+        print("\nDone!")
+
+    if in_flight:
+        # Worker threads can't be interrupted; don't let them hold the job open
+        print(f"Abandoning {len(in_flight)} unneeded candidate(s): {', '.join(in_flight.values())}")
+        sys.stdout.flush()
+        os._exit(exit_code)
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
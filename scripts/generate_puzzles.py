@@ -7,6 +7,7 @@ Usage:
   python3 scripts/generate_puzzles.py MSFT AMZN GOOG  # Generate multiple tickers
 """
 
+import hashlib
 import json
 import math
 import os
@@ -15,6 +16,8 @@ import time
 import requests
 import yfinance as yf
 
+from leak_check import redact_leaks
+
 
 def sanitize_float(v, default=0):
     """Convert a value to a JSON-safe float. NaN/Infinity → default."""
@@ -92,6 +95,26 @@ PUZZLES = [
 
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "public", "puzzles")
 
+# Bump whenever a change here alters the bytes of generated puzzle files, so
+# build_puzzles.py knows every existing target is stale.
+GENERATOR_VERSION = "2"
+
+# (puzzle chart key, yfinance period)
+CHART_PERIODS = [("1y", "1y"), ("1m", "1mo"), ("5y", "5y"), ("10y", "max")]
+
+# (puzzle chart key, yfinance period, bar interval) for intraday windows
+INTRADAY_PERIODS = [("1d", "1d", "5m"), ("5d", "5d", "30m")]
+
+# Intraday charts are stored compactly, see encode_intraday(). The format is
+# recorded per chart in the puzzle's "chartFormats" map.
+INTRADAY_FORMAT = "intraday-delta-v1"
+
+# Default serialization options for puzzle files
+FORMAT_OPTIONS = {"indent": 2}
+
+# Market-derived hints written by chart_analytics.py
+ANALYTICS_KEYS = ("volatility1y", "maxDrawdown1y", "beta1y", "correlation1y", "bestDay1y", "worstDay1y")
+
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
 
 
@@ -192,10 +215,16 @@ No quotes, no extra explanation."""
     return None
 
 
-def generate_difficulty_gemini(ticker: str, name: str, sector: str, industry: str) -> int:
-    """Ask Gemini to rate puzzle difficulty 1-5 based on how widely known the stock is."""
+def generate_difficulty_gemini(
+    ticker: str, name: str, sector: str, industry: str, default: int | None = 3
+) -> int | None:
+    """Ask Gemini to rate puzzle difficulty 1-5 based on how widely known the stock is.
+
+    Returns `default` (medium) when there is no API key or the request fails;
+    pass default=None to tell a failure apart from a real rating.
+    """
     if not GEMINI_API_KEY:
-        return 3  # default medium
+        return default
 
     prompt = f"""Rate how difficult it would be for an average retail investor to identify this stock in a guessing game, on a scale of 1 to 5:
 
@@ -220,8 +249,8 @@ Reply with ONLY a single digit: 1, 2, 3, 4, or 5. No explanation."""
     try:
         resp = requests.post(url, json=payload, timeout=30)
         if resp.status_code == 429:
-            print("  Difficulty rating rate-limited, defaulting to 3")
-            return 3
+            print("  Difficulty rating rate-limited")
+            return default
         resp.raise_for_status()
         result = resp.json()
         text = result["candidates"][0]["content"]["parts"][0]["text"].strip()
@@ -231,7 +260,7 @@ Reply with ONLY a single digit: 1, 2, 3, 4, or 5. No explanation."""
             return digit
     except Exception as e:
         print(f"  Difficulty rating failed: {e}")
-    return 3
+    return default
 
 
 def classify_market_cap(cap: float) -> str:
@@ -245,10 +274,8 @@ def classify_market_cap(cap: float) -> str:
         return "Small Cap (<$2B)"
 
 
-def fetch_chart_data(ticker: str, period: str):
-    """Fetch historical OHLC data and return as [[ts, open%, high%, low%, close%], ...] + base_price."""
-    stock = yf.Ticker(ticker)
-    hist = stock.history(period=period)
+def encode_daily(hist):
+    """Encode daily bars as [[ts, open%, high%, low%, close%], ...] + base_price."""
     if hist.empty:
         return [], 0
 
@@ -278,9 +305,62 @@ def fetch_chart_data(ticker: str, period: str):
     return result, base_price
 
 
-def get_52w_high_low(ticker: str):
+def fetch_chart_data(ticker: str, period: str):
+    """Fetch historical OHLC data and return as [[ts, open%, high%, low%, close%], ...] + base_price."""
     stock = yf.Ticker(ticker)
-    hist = stock.history(period="1y")
+    return encode_daily(stock.history(period=period))
+
+
+def encode_intraday(hist):
+    """Encode intraday bars compactly. Returns (rows, base_price).
+
+    Prices are fixed-point integers in hundredths of a percent of the base
+    price (the first close). The first row is [0, open, high, low, close];
+    every later row is [minutes since the previous bar, open, high, low,
+    close] with each price stored as a delta from the previous bar's close.
+    Overnight session gaps and half-days need no special casing: they simply
+    show up as a larger minute delta or as fewer bars.
+    """
+    if hist.empty:
+        return [], 0
+    hist = hist.dropna(subset=["Close"])
+    if hist.empty:
+        return [], 0
+
+    base_price = sanitize_float(hist["Close"].iloc[0])
+    if base_price == 0:
+        return [], 0
+
+    def fixed(v):
+        return int(round((v - base_price) / base_price * 10000))
+
+    rows = []
+    prev_ts = None
+    prev_close = 0
+    for date, row in hist.iterrows():
+        c = sanitize_float(row["Close"])
+        if c == 0:
+            continue
+        o = sanitize_float(row.get("Open", c)) or c
+        h = sanitize_float(row.get("High", c)) or c
+        l = sanitize_float(row.get("Low", c)) or c
+        ts = int(date.timestamp())
+        minutes = 0 if prev_ts is None else (ts - prev_ts) // 60
+        fc = fixed(c)
+        rows.append([minutes, fixed(o) - prev_close, fixed(h) - prev_close, fixed(l) - prev_close, fc - prev_close])
+        prev_ts = ts
+        prev_close = fc
+    return rows, base_price
+
+
+def fetch_intraday_data(ticker: str, period: str, interval: str):
+    """Fetch intraday bars and return them encoded by encode_intraday()."""
+    stock = yf.Ticker(ticker)
+    return encode_intraday(stock.history(period=period, interval=interval))
+
+
+def high_low(hist):
+    """Rounded (high, low) over a window of bars, (0, 0) if empty."""
     if hist.empty:
         return 0, 0
     high = sanitize_float(hist["High"].max())
@@ -288,14 +368,17 @@ def get_52w_high_low(ticker: str):
     return round(high, 2), round(low, 2)
 
 
-def generate_puzzle(puzzle_def: dict) -> dict:
-    ticker = puzzle_def["ticker"]
-    print(f"Fetching data for {ticker}...")
+def get_52w_high_low(ticker: str):
+    stock = yf.Ticker(ticker)
+    return high_low(stock.history(period="1y"))
+
 
+def fetch_market_snapshot(ticker: str) -> dict:
+    """Fetch every chart window plus the 52-week range for a ticker."""
     charts = {}
     base_prices = {}
 
-    for period_key, yf_period in [("1y", "1y"), ("1m", "1mo"), ("5y", "5y"), ("10y", "max")]:
+    for period_key, yf_period in CHART_PERIODS:
         try:
             data, bp = fetch_chart_data(ticker, yf_period)
             charts[period_key] = data
@@ -305,36 +388,63 @@ def generate_puzzle(puzzle_def: dict) -> dict:
             charts[period_key] = []
             base_prices[period_key] = 0
 
+    chart_formats = {}
+    for period_key, yf_period, interval in INTRADAY_PERIODS:
+        try:
+            data, bp = fetch_intraday_data(ticker, yf_period, interval)
+        except Exception as e:
+            print(f"  Warning: failed to fetch {period_key} for {ticker}: {e}")
+            continue
+        if data:
+            charts[period_key] = data
+            base_prices[period_key] = round(bp, 2)
+            chart_formats[period_key] = INTRADAY_FORMAT
+
     high52w, low52w = get_52w_high_low(ticker)
 
+    return {
+        "charts": charts,
+        "basePrices": base_prices,
+        "chartFormats": chart_formats,
+        "high52w": high52w,
+        "low52w": low52w,
+    }
+
+
+def assemble_puzzle(puzzle_def: dict, market: dict) -> dict:
+    """Combine a puzzle definition (id/ticker/name/hints) with a market snapshot."""
     hints = dict(puzzle_def["hints"])
-    hints["high52w"] = high52w
-    hints["low52w"] = low52w
+    hints["high52w"] = market["high52w"]
+    hints["low52w"] = market["low52w"]
+    hints.update(market.get("analytics", {}))
 
-    return {
+    puzzle = {
         "id": puzzle_def["id"],
-        "answer": {"ticker": ticker, "name": puzzle_def["name"]},
-        "basePrice": base_prices.get("1m", 0),
-        "basePrices": base_prices,
-        "charts": charts,
+        "answer": {"ticker": puzzle_def["ticker"], "name": puzzle_def["name"]},
+        "basePrice": market["basePrices"].get("1m", 0),
+        "basePrices": market["basePrices"],
+        "charts": market["charts"],
         "hints": hints,
     }
+    if market.get("chartFormats"):
+        puzzle["chartFormats"] = market["chartFormats"]
+    if puzzle_def.get("difficulty") is not None:
+        puzzle["difficulty"] = puzzle_def["difficulty"]
+    return puzzle
 
 
-def generate_from_ticker(ticker: str) -> dict:
-    """Auto-generate a puzzle for any ticker by pulling metadata from yfinance."""
-    ticker = ticker.upper()
-    print(f"Auto-generating puzzle for {ticker}...")
+def generate_puzzle(puzzle_def: dict) -> dict:
+    ticker = puzzle_def["ticker"]
+    print(f"Fetching data for {ticker}...")
+    return assemble_puzzle(puzzle_def, fetch_market_snapshot(ticker))
 
+
+def fetch_ticker_metadata(ticker: str) -> dict:
+    """Pull the static company metadata used for hints from yfinance."""
     stock = yf.Ticker(ticker)
     info = stock.info
 
-    name = info.get("longName") or info.get("shortName") or ticker
-    sector = info.get("sector", "Unknown")
-    industry = info.get("industry", "Unknown")
-    country = info.get("country", "Unknown")
     market_cap = info.get("marketCap", 0)
-    market_cap_range = classify_market_cap(market_cap)
 
     ipo_year = None
     try:
@@ -349,18 +459,42 @@ def generate_from_ticker(ticker: str) -> dict:
     except Exception:
         pass
 
+    return {
+        "name": info.get("longName") or info.get("shortName") or ticker,
+        "sector": info.get("sector", "Unknown"),
+        "industry": info.get("industry", "Unknown"),
+        "hqCountry": info.get("country", "Unknown"),
+        "marketCapRange": classify_market_cap(market_cap),
+        "ipoYear": ipo_year or 2000,
+        "summary": info.get("longBusinessSummary", ""),
+    }
+
+
+def generate_llm_outputs(ticker: str, meta: dict, strict: bool = False) -> dict:
+    """Description, fun facts and difficulty for a ticker (Gemini, with a yfinance fallback).
+
+    With strict=True a Gemini failure (no key, rate limit, bad response)
+    raises RuntimeError instead of falling back, for callers that would
+    otherwise replace existing outputs with the placeholders.
+    """
+    name = meta["name"]
+    sector = meta["sector"]
+    industry = meta["industry"]
+
     # Try Gemini for a smart redacted description + fun facts
     gemini_result = generate_description_gemini(
-        ticker, name, sector, industry, country, ipo_year
+        ticker, name, sector, industry, meta["hqCountry"], meta["ipoYear"]
     )
 
     if gemini_result:
         description = gemini_result["description"]
         fun_fact_1 = gemini_result["funFact1"]
         fun_fact_2 = gemini_result["funFact2"]
+    elif strict:
+        raise RuntimeError(f"Gemini description failed for {ticker}")
     else:
         # Fallback: basic description from yfinance
-        raw = info.get("longBusinessSummary", "")
+        raw = meta.get("summary", "")
         if raw:
             sentences = raw.split(". ")
             description = sentences[0] + "."
@@ -371,28 +505,182 @@ def generate_from_ticker(ticker: str) -> dict:
         fun_fact_1 = ""
         fun_fact_2 = ""
 
+    # Neither Gemini nor the fallback reliably hides the answer
+    description = redact_leaks(description, ticker)
+    fun_fact_1 = redact_leaks(fun_fact_1, ticker)
+    fun_fact_2 = redact_leaks(fun_fact_2, ticker)
+
     # Get difficulty rating from Gemini
-    difficulty = generate_difficulty_gemini(ticker, name, sector, industry)
+    difficulty = generate_difficulty_gemini(ticker, name, sector, industry, default=None if strict else 3)
+    if difficulty is None:
+        raise RuntimeError(f"Gemini difficulty rating failed for {ticker}")
+
+    return {
+        "description": description,
+        "funFact1": fun_fact_1,
+        "funFact2": fun_fact_2,
+        "difficulty": difficulty,
+    }
 
-    puzzle_def = {
-        "id": ticker.lower(),
+
+def puzzle_def_from_inputs(puzzle_id: str, ticker: str, meta: dict, llm: dict) -> dict:
+    """Build a puzzle definition from cached metadata and LLM outputs."""
+    hints = {
+        "sector": meta["sector"],
+        "industry": meta["industry"],
+        "marketCapRange": meta["marketCapRange"],
+        "hqCountry": meta["hqCountry"],
+        "description": llm["description"],
+    }
+    # Older puzzles predate fun facts; keep them absent rather than empty
+    for key in ("funFact1", "funFact2"):
+        if key in llm:
+            hints[key] = llm[key]
+    hints["ipoYear"] = meta["ipoYear"]
+
+    return {
+        "id": puzzle_id,
         "ticker": ticker,
-        "name": name,
-        "hints": {
-            "sector": sector,
-            "industry": industry,
-            "marketCapRange": market_cap_range,
-            "hqCountry": country,
-            "description": description,
-            "funFact1": fun_fact_1,
-            "funFact2": fun_fact_2,
-            "ipoYear": ipo_year or 2000,
-        },
+        "name": meta["name"],
+        "hints": hints,
+        "difficulty": llm.get("difficulty"),
     }
 
-    result = generate_puzzle(puzzle_def)
-    result["difficulty"] = difficulty
-    return result
+
+def generate_from_ticker(ticker: str) -> dict:
+    """Auto-generate a puzzle for any ticker by pulling metadata from yfinance."""
+    ticker = ticker.upper()
+    print(f"Auto-generating puzzle for {ticker}...")
+
+    from chart_analytics import analytics_for
+
+    meta = fetch_ticker_metadata(ticker)
+    llm = generate_llm_outputs(ticker, meta)
+    puzzle_def = puzzle_def_from_inputs(ticker.lower(), ticker, meta, llm)
+    market = fetch_market_snapshot(ticker)
+    market["analytics"] = analytics_for({ticker: market["charts"].get("1y", [])})[ticker]
+    return assemble_puzzle(puzzle_def, market)
+
+
+def serialize_puzzle(puzzle: dict, options: dict | None = None) -> bytes:
+    """Encode a puzzle exactly as it is written to public/puzzles."""
+    opts = FORMAT_OPTIONS if options is None else options
+    return json.dumps(
+        puzzle, indent=opts.get("indent"), ensure_ascii=opts.get("ensure_ascii", True), cls=SafeJSONEncoder
+    ).encode()
+
+
+def write_if_changed(path: str, data: bytes) -> bool:
+    """Write `data` to `path` unless the file already holds the same bytes.
+
+    Returns True when the file was written.
+    """
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(path, "wb") as f:
+        f.write(data)
+    return True
+
+
+def fingerprint(obj) -> str:
+    """Stable sha256 of a JSON-serializable object (or raw bytes)."""
+    if not isinstance(obj, bytes):
+        obj = json.dumps(obj, sort_keys=True, separators=(",", ":"), cls=SafeJSONEncoder).encode()
+    return hashlib.sha256(obj).hexdigest()
+
+
+def write_puzzle(path: str, puzzle: dict, options: dict | None = None) -> bool:
+    """Serialize and write a puzzle file, skipping the write if nothing changed."""
+    return write_if_changed(path, serialize_puzzle(puzzle, options))
+
+
+# Top-level fields after "charts" in a serialized puzzle; see read_puzzle_tail()
+TAIL_MARKER = b',\n  "hints": '
+TAIL_READ_SIZE = 64 * 1024
+
+
+def read_puzzle_head(path: str) -> dict:
+    """Read just the id and answer of a puzzle file without parsing its charts."""
+    with open(path, "rb") as f:
+        head = f.read(4096).decode("utf-8", errors="ignore")
+    decoder = json.JSONDecoder()
+    out = {}
+    for key in ("id", "answer"):
+        marker = f'"{key}": '
+        pos = head.find(marker)
+        if pos == -1:
+            with open(path) as f:
+                puzzle = json.load(f)
+            return {"id": puzzle["id"], "answer": puzzle["answer"]}
+        out[key], _ = decoder.raw_decode(head, pos + len(marker))
+    return out
+
+
+def read_puzzle_tail(path: str) -> tuple[dict, int]:
+    """Read the fields that follow the charts (hints, difficulty, ...).
+
+    Puzzle files end with the small metadata fields after the large chart
+    arrays, so this only reads the end of the file. Returns (fields, offset)
+    where offset is where those fields start; -1 means the file had to be
+    parsed in full and cannot be patched in place.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        f.seek(max(0, size - TAIL_READ_SIZE))
+        tail = f.read()
+    pos = tail.rfind(TAIL_MARKER)
+    if pos != -1:
+        try:
+            fields = json.loads(b"{" + tail[pos + 1:])
+            return fields, size - len(tail) + pos
+        except ValueError:
+            pass
+    with open(path) as f:
+        puzzle = json.load(f)
+    fields = {k: v for k, v in puzzle.items() if k not in ("id", "answer", "basePrice", "basePrices", "charts")}
+    return fields, -1
+
+
+def patch_puzzle_tail(path: str, fields: dict, offset: int) -> bool:
+    """Rewrite only the fields after the charts, leaving the chart bytes untouched.
+
+    `fields` and `offset` come from read_puzzle_tail(). Returns True if the
+    file changed.
+    """
+    if offset == -1:
+        with open(path) as f:
+            puzzle = json.load(f)
+        puzzle.update(fields)
+        return write_if_changed(path, serialize_puzzle(puzzle))
+    with open(path, "rb") as f:
+        prefix = f.read(offset)
+    tail = json.dumps(fields, indent=FORMAT_OPTIONS["indent"], cls=SafeJSONEncoder).encode()
+    return write_if_changed(path, prefix + b"," + tail[1:])
+
+
+def read_puzzle_chart(path: str, key: str = "1y") -> list:
+    """Read one chart window without parsing the rest of the file.
+
+    The 1y chart comes first in every generated puzzle, so it is decoded
+    straight from the start of the file; other layouts fall back to a full parse.
+    """
+    marker = f'"{key}": ['
+    with open(path, "rb") as f:
+        head = f.read(TAIL_READ_SIZE * 2).decode("utf-8", errors="ignore")
+    charts_pos = head.find('"charts": {')
+    pos = head.find(marker, charts_pos) if charts_pos != -1 else -1
+    if pos != -1:
+        try:
+            chart, _ = json.JSONDecoder().raw_decode(head, pos + len(marker) - 1)
+            return chart
+        except ValueError:
+            pass
+    with open(path) as f:
+        return json.load(f).get("charts", {}).get(key, [])
 
 
 def main():
@@ -408,14 +696,20 @@ def main():
                     print(f"  {key}: {len(data)} data points")
 
                 path = os.path.join(OUTPUT_DIR, f"{ticker.lower()}.json")
-                with open(path, "w") as f:
-                    json.dump(puzzle, f, indent=2, cls=SafeJSONEncoder)
-                print(f"  Wrote {path}")
+                if write_puzzle(path, puzzle):
+                    print(f"  Wrote {path}")
+                else:
+                    print(f"  Unchanged {path}")
             except Exception as e:
                 print(f"  ERROR generating {ticker}: {e}")
             # Brief pause between tickers to avoid rate limits
             if i < len(tickers) - 1 and GEMINI_API_KEY:
                 time.sleep(2)
+
+        # Keep guess autocomplete in sync with the corpus
+        from build_ticker_index import write_ticker_index
+        if write_ticker_index():
+            print("  Updated ticker index")
         print("\nDone!")
         return
 
@@ -427,9 +721,10 @@ def main():
             print(f"  {key}: {len(data)} data points")
 
         path = os.path.join(OUTPUT_DIR, f"{puzzle_def['id']}.json")
-        with open(path, "w") as f:
-            json.dump(puzzle, f, indent=2, cls=SafeJSONEncoder)
-        print(f"  Wrote {path}")
+        if write_puzzle(path, puzzle):
+            print(f"  Wrote {path}")
+        else:
+            print(f"  Unchanged {path}")
 
     print("\nDone!")
 
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""Detect answer leaks in puzzle descriptions and fun facts.
+
+Gemini is asked to redact the company name, ticker and flagship products, and
+the non-Gemini fallback only swaps out the exact company name — nothing checks
+the result. This builds one multi-pattern matcher from sp500_tickers.json
+(full names, distinctive name fragments, ticker symbols) plus a curated list
+of flagship products, scans every puzzle's text hints in a single pass, and
+reports any pattern that belongs to the puzzle's own answer.
+
+With --fix, leaks are masked using the same asterisk convention as the
+Gemini prompt ("Big Mac" -> "*** ***"). Puzzles where masking would blank out
+too much of a hint are listed as needing a fresh LLM description.
+
+Usage:
+  python3 scripts/leak_check.py              # Report leaks across the corpus
+  python3 scripts/leak_check.py AAPL IBM     # Only these tickers
+  python3 scripts/leak_check.py --fix        # Mask leaks in place
+"""
+
+import argparse
+import functools
+import json
+import os
+import re
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SP500_PATH = os.path.join(SCRIPT_DIR, "sp500_tickers.json")
+PUZZLES_DIR = os.path.join(SCRIPT_DIR, "..", "public", "puzzles")
+
+# Hint fields that are shown as free text
+TEXT_FIELDS = ("description", "funFact1", "funFact2")
+
+# A masked field with more than this share of asterisks is no longer useful
+MAX_MASKED_SHARE = 0.25
+
+# Name fragments shared by more than this many companies are too generic to count
+MAX_FRAGMENT_OWNERS = 2
+
+# Corporate suffixes and industry words that never identify a company on their own
+GENERIC_NAME_WORDS = {
+    "Inc", "Corporation", "Corp", "Company", "Companies", "Co", "Group", "Holdings",
+    "Holding", "plc", "Ltd", "Limited", "Class", "The", "of", "and", "Trust", "Bancorp",
+    "Technologies", "Technology", "International", "Global", "Services", "Solutions",
+    "Systems", "Industries", "Brands", "Resources", "Materials", "Energy", "Financial",
+    "Health", "Healthcare", "Capital", "Management", "Enterprise", "Enterprises",
+    "Properties", "Property", "Realty", "Communities", "Communications", "Digital",
+    "Networks", "Devices", "Electric", "Power", "Air", "Bank", "America", "American",
+    "United", "General", "Scientific", "Laboratories", "Storage", "Entertainment",
+    "Resorts", "Works", "Dollar", "Business", "Machines", "Products", "Partners",
+    "Insurance", "Pharmaceuticals", "Therapeutics", "Semiconductor", "Software",
+    "Foods", "Motors", "Airlines", "Lines", "Hotels", "Stores", "Labs", "Data",
+    "Street", "First", "National", "Southern", "Western", "Eastern", "Northern",
+    "Public", "Service", "Utilities", "Gas", "Water", "Oil", "Medical", "Life",
+    "Sciences", "Logistics", "Media", "Platforms", "Instruments", "Controls",
+    "Equipment", "Chemical", "Mining", "Realty", "Residential", "Home", "Homes",
+    "Builders", "Restaurants", "Transport", "Beverage", "Cruise", "Line", "Beauty",
+}
+
+# A single capitalized word that could also be ordinary prose ("News", "Tide")
+ORDINARY_WORD = re.compile(r"[A-Z][a-z'\-]*")
+
+# Flagship products that give the answer away as surely as the company name
+PRODUCTS = {
+    "AAPL": ["iPhone", "iPad", "iPod", "MacBook", "Macintosh", "iMac", "iTunes", "Apple Watch"],
+    "MSFT": ["Windows", "Xbox", "Azure", "Office 365", "Bing"],
+    "GOOGL": ["Google", "YouTube", "Android", "Gmail"],
+    "GOOG": ["Google", "YouTube", "Android", "Gmail"],
+    "AMZN": ["Kindle", "Alexa", "AWS", "Prime Video"],
+    "META": ["Facebook", "Instagram", "WhatsApp", "Oculus"],
+    "NVDA": ["GeForce", "CUDA"],
+    "TSLA": ["Cybertruck", "Powerwall", "Model S"],
+    "NFLX": ["Stranger Things"],
+    "MCD": ["Big Mac", "McDonald", "Happy Meal"],
+    "KO": ["Coke", "Sprite"],
+    "PEP": ["Pepsi", "Doritos", "Gatorade"],
+    "SBUX": ["Frappuccino"],
+    "NKE": ["Air Jordan", "Swoosh"],
+    "DIS": ["Mickey Mouse", "Disneyland", "Pixar", "Marvel"],
+    "CMG": ["Chipotle"],
+    "YUM": ["KFC", "Taco Bell", "Pizza Hut"],
+    "DPZ": ["Domino"],
+    "HSY": ["Hershey", "Reese"],
+    "MDLZ": ["Oreo", "Cadbury"],
+    "PG": ["Tide", "Pampers", "Gillette"],
+    "CL": ["Colgate"],
+    "CLX": ["Clorox"],
+    "F": ["Mustang", "F-150"],
+    "GM": ["Chevrolet", "Cadillac"],
+    "BA": ["Dreamliner"],
+    "ABNB": ["Airbnb"],
+    "UBER": ["Uber Eats"],
+    "V": ["Visa"],
+    "MA": ["Mastercard"],
+    "PYPL": ["PayPal", "Venmo"],
+    "CRM": ["Salesforce"],
+    "ADBE": ["Photoshop", "Acrobat"],
+    "ORCL": ["Oracle Database"],
+    "INTC": ["Pentium"],
+    "AMD": ["Ryzen", "Radeon"],
+    "IBM": ["Watson", "Big Blue"],
+    "LLY": ["Mounjaro", "Zepbound"],
+    "PFE": ["Viagra", "Lipitor"],
+    "ABBV": ["Humira", "Botox"],
+    "WMT": ["Walmart", "Sam's Club"],
+    "COST": ["Kirkland Signature"],
+    "HD": ["Home Depot"],
+    "BKNG": ["Booking.com", "Priceline"],
+    "EXPE": ["Vrbo"],
+    "CZR": ["Caesars Palace"],
+    "CHTR": ["Spectrum"],
+    "LUV": ["Southwest"],
+}
+
+
+def load_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def name_fragments(name: str) -> list[str]:
+    """Distinctive words from a company name ("Agilent Technologies" -> ["Agilent"])."""
+    words = re.findall(r"[A-Za-z][A-Za-z'\-]*[A-Za-z]", name)
+    return [w for w in words if len(w) >= 3 and w not in GENERIC_NAME_WORDS]
+
+
+class LeakMatcher:
+    """Compiled alternations over every giveaway pattern, mapped back to their owners.
+
+    Multi-word names and products, and single words that can't be ordinary
+    words ("lululemon", "CarMax", "iPhone"), match case-insensitively
+    ("capital one"). Capitalized single words ("News", "Windows") and ticker
+    symbols only match as written, so "news" and "all" never match.
+    """
+
+    def __init__(self, companies: list[dict], false_positive_tickers: set[str] = frozenset()):
+        owners: dict[str, set[str]] = {}
+        exact_owners: dict[str, set[str]] = {}
+        fragment_owners: dict[str, set[str]] = {}
+
+        def add(pattern, ticker, table=None):
+            pattern = pattern.strip().rstrip(".")
+            if len(pattern) < 2:
+                return
+            if table is None:
+                table = exact_owners if ORDINARY_WORD.fullmatch(pattern) else owners
+            key = pattern.lower() if table is owners else pattern
+            table.setdefault(key, set()).add(ticker)
+
+        for company in companies:
+            ticker = company["ticker"].upper()
+            name = company["name"]
+            add(name, ticker)
+            add(re.sub(r",?\s+(Inc|Corporation|Corp|Company|Co|plc|Ltd)\.?$", "", name), ticker)
+            for fragment in name_fragments(name):
+                add(fragment, ticker, fragment_owners)
+            if len(ticker) >= 2 and ticker not in false_positive_tickers:
+                add(ticker, ticker, exact_owners)
+            for product in PRODUCTS.get(ticker, []):
+                add(product, ticker)
+
+        for fragment, tickers in fragment_owners.items():
+            if len(tickers) <= MAX_FRAGMENT_OWNERS:
+                for ticker in tickers:
+                    add(fragment, ticker)
+
+        self.owners = owners
+        self.exact_owners = exact_owners
+        self.regex = self._compile(owners, re.IGNORECASE)
+        self.exact_regex = self._compile(exact_owners)
+
+    @staticmethod
+    def _compile(patterns, flags=0):
+        # Longest first so "Big Mac" wins over "Mac" and full names over fragments
+        alternation = "|".join(re.escape(p) for p in sorted(patterns, key=len, reverse=True))
+        return re.compile(rf"(?<![\w*])(?:{alternation})(?![\w*])", flags)
+
+    def find(self, text: str, ticker: str) -> list[re.Match]:
+        """Non-overlapping matches in `text` that identify `ticker`, in order."""
+        ticker = ticker.upper()
+        found = [m for m in self.regex.finditer(text) if ticker in self.owners[m.group(0).lower()]]
+        found += [m for m in self.exact_regex.finditer(text) if ticker in self.exact_owners[m.group(0)]]
+        found.sort(key=lambda m: (m.start(), -m.end()))
+        out = []
+        for m in found:
+            if not out or m.start() >= out[-1].end():
+                out.append(m)
+        return out
+
+
+def mask(text: str, matches: list[re.Match]) -> str:
+    """Replace each match with asterisks, one per character, keeping spaces."""
+    out = []
+    last = 0
+    for m in matches:
+        out.append(text[last:m.start()])
+        out.append(re.sub(r"\S", "*", m.group(0)))
+        last = m.end()
+    out.append(text[last:])
+    return "".join(out)
+
+
+def masked_share(text: str) -> float:
+    return text.count("*") / max(len(text), 1)
+
+
+def build_matcher(puzzles: list[dict] | None = None) -> LeakMatcher:
+    """Matcher over the S&P 500 list plus the answer names used in the corpus."""
+    from reddit_scraper import FALSE_POSITIVES
+
+    companies = load_json(SP500_PATH)
+    for puzzle in puzzles or []:
+        companies.append(puzzle["answer"])
+    return LeakMatcher(companies, FALSE_POSITIVES)
+
+
+@functools.lru_cache(maxsize=1)
+def default_matcher() -> LeakMatcher:
+    return build_matcher()
+
+
+def redact_leaks(text: str, ticker: str) -> str:
+    """Mask anything in `text` that gives away `ticker` (used by the generator)."""
+    found = default_matcher().find(text, ticker)
+    return mask(text, found) if found else text
+
+
+def check_puzzle(matcher: LeakMatcher, puzzle: dict) -> dict:
+    """Return {field: [matched text, ...]} for every leaking text hint."""
+    ticker = puzzle["answer"]["ticker"]
+    hints = puzzle.get("hints", {})
+    leaks = {}
+    for field in TEXT_FIELDS:
+        found = matcher.find(hints.get(field) or "", ticker)
+        if found:
+            leaks[field] = [m.group(0) for m in found]
+    return leaks
+
+
+def fix_puzzle(matcher: LeakMatcher, puzzle: dict) -> list[str]:
+    """Mask leaks in place. Returns the fields that are too redacted to keep."""
+    ticker = puzzle["answer"]["ticker"]
+    hints = puzzle["hints"]
+    unusable = []
+    for field in TEXT_FIELDS:
+        text = hints.get(field) or ""
+        found = matcher.find(text, ticker)
+        if not found:
+            continue
+        hints[field] = mask(text, found)
+        if masked_share(hints[field]) > MAX_MASKED_SHARE:
+            unusable.append(field)
+    return unusable
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find answer leaks in puzzle hints.")
+    parser.add_argument("tickers", nargs="*", help="tickers to check (default: whole corpus)")
+    parser.add_argument("--fix", action="store_true", help="mask leaks in place with asterisks")
+    args = parser.parse_args()
+
+    if args.tickers:
+        names = [f"{t.lower()}.json" for t in args.tickers]
+    else:
+        names = sorted(n for n in os.listdir(PUZZLES_DIR) if n.endswith(".json"))
+
+    from generate_puzzles import patch_puzzle_tail, read_puzzle_head, read_puzzle_tail
+
+    # Only the answer and the hints are needed, so skip parsing the charts
+    puzzles = {}
+    offsets = {}
+    for name in names:
+        path = os.path.join(PUZZLES_DIR, name)
+        tail, offsets[name] = read_puzzle_tail(path)
+        puzzles[name] = {**read_puzzle_head(path), **tail}
+
+    matcher = build_matcher(list(puzzles.values()))
+    print(f"Matcher: {len(matcher.owners) + len(matcher.exact_owners)} patterns, scanning {len(puzzles)} puzzles")
+
+    leaking = []
+    needs_regen = []
+    for name, puzzle in puzzles.items():
+        leaks = check_puzzle(matcher, puzzle)
+        if not leaks:
+            continue
+        ticker = puzzle["answer"]["ticker"]
+        leaking.append(ticker)
+        for field, found in leaks.items():
+            print(f"  {ticker:<8}{field:<13}{', '.join(sorted(set(found)))}")
+
+        if args.fix:
+            unusable = fix_puzzle(matcher, puzzle)
+            tail = {k: v for k, v in puzzle.items() if k not in ("id", "answer")}
+            patch_puzzle_tail(os.path.join(PUZZLES_DIR, name), tail, offsets[name])
+            if unusable:
+                needs_regen.append(ticker)
+
+    print(f"\n{len(leaking)} of {len(puzzles)} puzzles leak their answer")
+    if args.fix:
+        print(f"Masked leaks in {len(leaking)} puzzles")
+        if needs_regen:
+            print(f"Too redacted to keep, regenerate with regen_description.py: {' '.join(needs_regen)}")
+    elif leaking:
+        print("Regenerate with: python3 scripts/regen_description.py --where leaks")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
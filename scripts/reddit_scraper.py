@@ -3,11 +3,22 @@
 Reddit Ticker Scraper
 Scrapes popular stock subreddits for ticker mentions and outputs a frequency report.
 Uses Reddit's public JSON API (no API key needed).
+
+Processed post IDs and their ticker mentions are kept in a local SQLite store
+(scripts/reddit_mentions.db). Each run pages /new newest-first and stops at the
+first post an earlier run already stored, since everything after it is older. The text report is a view over
+the store with rolling 1d/7d/30d mention counts.
+
+Usage:
+  python3 scripts/reddit_scraper.py                # Scrape new posts, then write the report
+  python3 scripts/reddit_scraper.py --report-only  # Rewrite the report from the store
 """
 
+import argparse
 import json
 import os
 import re
+import sqlite3
 import time
 from collections import Counter
 from datetime import datetime
@@ -15,6 +26,11 @@ from datetime import datetime
 import requests
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, "reddit_mentions.db")
+REPORT_PATH = os.path.join(SCRIPT_DIR, "reddit_tickers.txt")
+
+# Rolling windows for the trending report: (label, seconds)
+WINDOWS = [("1D", 86400), ("7D", 7 * 86400), ("30D", 30 * 86400)]
 
 SUBREDDITS = ["wallstreetbets", "stocks", "investing", "stockmarket", "options"]
 
@@ -97,14 +113,64 @@ def extract_tickers(text, valid_tickers):
     return [t for t in matches if t in valid_tickers and t not in FALSE_POSITIVES]
 
 
-def scrape_subreddit(subreddit, valid_tickers, limit=100):
-    """Scrape hot posts from a subreddit and extract ticker mentions."""
-    tickers = []
+def open_store(path=DB_PATH):
+    """Open (and if needed create) the post/mention store."""
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS posts (
+            id TEXT PRIMARY KEY,
+            subreddit TEXT NOT NULL,
+            created_utc INTEGER NOT NULL,
+            scraped_utc INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS mentions (
+            post_id TEXT NOT NULL REFERENCES posts(id),
+            ticker TEXT NOT NULL,
+            subreddit TEXT NOT NULL,
+            created_utc INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (post_id, ticker)
+        );
+        CREATE INDEX IF NOT EXISTS idx_mentions_created ON mentions(created_utc, ticker);
+    """)
+    return conn
+
+
+def seen_post_ids(conn, ids):
+    """Subset of `ids` already in the store."""
+    if not ids:
+        return set()
+    placeholders = ",".join("?" * len(ids))
+    rows = conn.execute(f"SELECT id FROM posts WHERE id IN ({placeholders})", list(ids))
+    return {row[0] for row in rows}
+
+
+def store_post(conn, subreddit, post, tickers, scraped_utc):
+    created = int(post.get("created_utc") or scraped_utc)
+    conn.execute(
+        "INSERT OR IGNORE INTO posts (id, subreddit, created_utc, scraped_utc) VALUES (?, ?, ?, ?)",
+        (post["id"], subreddit, created, scraped_utc),
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO mentions (post_id, ticker, subreddit, created_utc, count) VALUES (?, ?, ?, ?, ?)",
+        [(post["id"], t, subreddit, created, n) for t, n in Counter(tickers).items()],
+    )
+
+
+def scrape_subreddit(subreddit, valid_tickers, conn, limit=100):
+    """Scrape posts newer than the store from a subreddit. Returns (new posts, mentions).
+
+    /new is strictly newest-first, so reaching a stored post means nothing
+    newer remains. (/hot is not chronological: stickies and long-running posts
+    keep page 1 "seen" while new posts enter further down.)
+    """
+    new_posts = 0
+    mentions = 0
     after = None
     fetched = 0
 
     while fetched < limit:
-        url = f"https://www.reddit.com/r/{subreddit}/hot.json?limit=25&raw_json=1"
+        url = f"https://www.reddit.com/r/{subreddit}/new.json?limit=25&raw_json=1"
         if after:
             url += f"&after={after}"
 
@@ -119,15 +185,27 @@ def scrape_subreddit(subreddit, valid_tickers, limit=100):
                 break
 
             data = res.json()
-            posts = data.get("data", {}).get("children", [])
+            posts = [post.get("data", {}) for post in data.get("data", {}).get("children", [])]
+            posts = [p for p in posts if p.get("id")]
             if not posts:
                 break
 
-            for post in posts:
-                p = post.get("data", {})
+            seen = seen_post_ids(conn, [p["id"] for p in posts])
+            scraped_utc = int(time.time())
+            for p in posts:
+                if p["id"] in seen:
+                    continue
                 title = p.get("title", "")
                 selftext = p.get("selftext", "")
-                tickers.extend(extract_tickers(title + " " + selftext, valid_tickers))
+                tickers = extract_tickers(title + " " + selftext, valid_tickers)
+                store_post(conn, subreddit, p, tickers, scraped_utc)
+                new_posts += 1
+                mentions += len(tickers)
+            conn.commit()
+
+            # Caught up with an earlier run; the rest is older
+            if seen:
+                break
 
             after = data.get("data", {}).get("after")
             fetched += len(posts)
@@ -142,39 +220,71 @@ def scrape_subreddit(subreddit, valid_tickers, limit=100):
             print(f"  Error scraping r/{subreddit}: {e}")
             break
 
-    return tickers
-
+    return new_posts, mentions
 
-def main():
-    valid_tickers = load_valid_tickers()
-    print(f"Loaded {len(valid_tickers)} valid S&P 500 tickers")
 
-    all_tickers = []
+def trending_counts(conn, now=None):
+    """{ticker: [count per window in WINDOWS]} from the indexed mention store."""
+    now = int(now or time.time())
+    counts = {}
+    for i, (_, seconds) in enumerate(WINDOWS):
+        rows = conn.execute(
+            "SELECT ticker, SUM(count) FROM mentions WHERE created_utc >= ? GROUP BY ticker",
+            (now - seconds,),
+        )
+        for ticker, n in rows:
+            counts.setdefault(ticker, [0] * len(WINDOWS))[i] = n
+    return counts
 
-    for sub in SUBREDDITS:
-        print(f"Scraping r/{sub}...")
-        tickers = scrape_subreddit(sub, valid_tickers, limit=100)
-        print(f"  Found {len(tickers)} ticker mentions")
-        all_tickers.extend(tickers)
-        time.sleep(3)  # pause between subreddits
 
-    counts = Counter(all_tickers)
-    sorted_tickers = counts.most_common()
+def write_report(conn, path=REPORT_PATH):
+    counts = trending_counts(conn)
+    # Sort by the 7-day count, then 30-day
+    ranked = sorted(counts.items(), key=lambda kv: (-kv[1][1], -kv[1][2], kv[0]))
+    total_posts = conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+    longest = len(WINDOWS) - 1
 
-    # Write output
-    output_path = os.path.join(SCRIPT_DIR, "reddit_tickers.txt")
-    with open(output_path, "w") as f:
+    with open(path, "w") as f:
         f.write("Reddit Ticker Frequency Report\n")
         f.write(f"Scraped: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
         f.write(f"Subreddits: {', '.join(SUBREDDITS)}\n")
-        f.write(f"Total mentions: {len(all_tickers)}\n")
-        f.write(f"Unique tickers: {len(sorted_tickers)}\n")
+        f.write(f"Posts stored: {total_posts}\n")
+        f.write(f"Total mentions ({WINDOWS[longest][0]}): {sum(c[longest] for c in counts.values())}\n")
+        f.write(f"Unique tickers ({WINDOWS[longest][0]}): {len(ranked)}\n")
         f.write("---\n")
-        for ticker, count in sorted_tickers:
-            f.write(f"{ticker:<8}{count}\n")
+        f.write(f"{'TICKER':<8}" + "".join(f"{label:<8}" for label, _ in WINDOWS).rstrip() + "\n")
+        for ticker, row in ranked:
+            f.write(f"{ticker:<8}" + "".join(f"{n:<8}" for n in row).rstrip() + "\n")
+    return ranked
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape Reddit for S&P 500 ticker mentions.")
+    parser.add_argument("--report-only", action="store_true", help="rewrite the report without scraping")
+    args = parser.parse_args()
+
+    conn = open_store()
+
+    if not args.report_only:
+        valid_tickers = load_valid_tickers()
+        print(f"Loaded {len(valid_tickers)} valid S&P 500 tickers")
+
+        total_posts = 0
+        total_mentions = 0
+        for sub in SUBREDDITS:
+            print(f"Scraping r/{sub}...")
+            new_posts, mentions = scrape_subreddit(sub, valid_tickers, conn, limit=100)
+            print(f"  {new_posts} new posts, {mentions} ticker mentions")
+            total_posts += new_posts
+            total_mentions += mentions
+            time.sleep(3)  # pause between subreddits
+        print(f"\nStored {total_posts} new posts with {total_mentions} mentions")
+
+    ranked = write_report(conn)
+    conn.close()
 
-    print(f"\nDone! {len(sorted_tickers)} unique tickers found across {len(all_tickers)} mentions")
-    print(f"Report saved to {output_path}")
+    print(f"\nDone! {len(ranked)} tickers mentioned in the last {WINDOWS[-1][0]}")
+    print(f"Report saved to {REPORT_PATH}")
 
 
 if __name__ == "__main__":
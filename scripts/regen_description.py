@@ -1,64 +1,231 @@
 #!/usr/bin/env python3
-"""Regenerate description (and difficulty) for an existing puzzle via Gemini.
+"""Regenerate description (and difficulty) for existing puzzles via Gemini.
+
+Puzzles can be picked by ticker or selected in bulk with --where predicates,
+evaluated on a hints-only scan that never parses the chart arrays. Only the
+hints/difficulty at the end of each file are rewritten.
+
+Predicates:
+  empty-fun-facts       funFact1/funFact2 missing, empty or the generic placeholder
+  fallback-description  description is the plain yfinance fallback text
+  default-ipo           ipoYear is the 2000 default (re-fetched from yfinance)
+  missing-difficulty    no difficulty rating
+  leaks                 description/fun facts give away the answer (see leak_check.py)
 
 Usage:
   python3 scripts/regen_description.py AAPL
+  python3 scripts/regen_description.py --where empty-fun-facts --where fallback-description --dry-run
+  python3 scripts/regen_description.py --where missing-difficulty --concurrency 2
+  python3 scripts/regen_description.py --where leaks --resume
 """
 
+import argparse
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 # Import shared Gemini helpers from generate_puzzles
 sys.path.insert(0, os.path.dirname(__file__))
-from generate_puzzles import generate_description_gemini, generate_difficulty_gemini, SafeJSONEncoder
+from generate_puzzles import (
+    fetch_ticker_metadata,
+    generate_description_gemini,
+    generate_difficulty_gemini,
+    patch_puzzle_tail,
+    read_puzzle_head,
+    read_puzzle_tail,
+)
+from leak_check import TEXT_FIELDS, build_matcher, redact_leaks
 
 PUZZLES_DIR = os.path.join(os.path.dirname(__file__), "..", "public", "puzzles")
+PROGRESS_PATH = os.path.join(os.path.dirname(__file__), ".build", "regen_progress.json")
+
+# Placeholders generate_description_gemini uses when Gemini omits a fun fact
+PLACEHOLDER_FUN_FACTS = {
+    "This company has an interesting history in its industry.",
+    "The company has made significant contributions to its sector.",
+}
+
+DEFAULT_CONCURRENCY = 2
+
+
+def is_fallback_description(description: str) -> bool:
+    return (
+        not description
+        or description == "A publicly traded company."
+        or description.startswith("The company")
+        or "[TICKER]" in description
+    )
+
+
+PREDICATES = {
+    "empty-fun-facts": lambda puzzle, hints: any(
+        not hints.get(k) or hints[k] in PLACEHOLDER_FUN_FACTS for k in ("funFact1", "funFact2")
+    ),
+    "fallback-description": lambda puzzle, hints: is_fallback_description(hints.get("description", "")),
+    "default-ipo": lambda puzzle, hints: hints.get("ipoYear") == 2000,
+    "missing-difficulty": lambda puzzle, hints: puzzle.get("difficulty") is None,
+}
+
 
+def scan(names: list[str], where: list[str]) -> list[tuple[str, list[str]]]:
+    """Hints-only scan. Returns [(file name, matched predicates)] for selected puzzles."""
+    matcher = build_matcher() if "leaks" in where else None
+    selected = []
+    for name in names:
+        path = os.path.join(PUZZLES_DIR, name)
+        tail, _ = read_puzzle_tail(path)
+        hints = tail.get("hints", {})
+        matched = [p for p in where if p in PREDICATES and PREDICATES[p](tail, hints)]
+        if matcher is not None:
+            ticker = read_puzzle_head(path)["answer"]["ticker"]
+            if any(matcher.find(hints.get(f) or "", ticker) for f in TEXT_FIELDS):
+                matched.append("leaks")
+        if matched:
+            selected.append((name, matched))
+    return selected
 
-def regen(ticker: str):
-    ticker_upper = ticker.upper()
-    ticker_lower = ticker.lower()
-    path = os.path.join(PUZZLES_DIR, f"{ticker_lower}.json")
+
+def regen(puzzle_id: str, refresh_ipo: bool = False) -> bool:
+    """Regenerate one puzzle's description and difficulty.
+
+    `puzzle_id` is the file name without .json (e.g. "aapl" or "sample-0");
+    the ticker comes from the puzzle's answer. Whatever Gemini returns is
+    written; anything it fails to return keeps the existing value. Returns
+    False if either request failed.
+    """
+    path = os.path.join(PUZZLES_DIR, f"{puzzle_id}.json")
 
     if not os.path.exists(path):
         print(f"ERROR: Puzzle file not found: {path}")
         sys.exit(1)
 
-    with open(path, "r") as f:
-        puzzle = json.load(f)
-
-    hints = puzzle.get("hints", {})
-    name = puzzle.get("answer", {}).get("name", ticker_upper)
+    tail, offset = read_puzzle_tail(path)
+    hints = tail.setdefault("hints", {})
+    answer = read_puzzle_head(path)["answer"]
+    ticker_upper = answer["ticker"].upper()
+    name = answer.get("name", ticker_upper)
     sector = hints.get("sector", "Unknown")
     industry = hints.get("industry", "Unknown")
     country = hints.get("hqCountry", "Unknown")
     ipo_year = hints.get("ipoYear")
 
-    print(f"Regenerating description for {ticker_upper} ({name})...")
+    print(f"Regenerating description for {ticker_upper} ({name}) in {puzzle_id}.json...")
+
+    if refresh_ipo:
+        fresh_year = fetch_ticker_metadata(ticker_upper)["ipoYear"]
+        if fresh_year != 2000:
+            hints["ipoYear"] = ipo_year = fresh_year
+            print(f"  IPO year: {fresh_year}")
 
+    ok = True
     gemini_result = generate_description_gemini(ticker_upper, name, sector, industry, country, ipo_year)
     if gemini_result:
-        puzzle["hints"]["description"] = gemini_result["description"]
-        puzzle["hints"]["funFact1"] = gemini_result["funFact1"]
-        puzzle["hints"]["funFact2"] = gemini_result["funFact2"]
-        print(f"  New description: {gemini_result['description'][:80]}...")
-        print(f"  Fun fact 1: {gemini_result['funFact1'][:60]}...")
-        print(f"  Fun fact 2: {gemini_result['funFact2'][:60]}...")
+        for key in ("description", "funFact1", "funFact2"):
+            hints[key] = redact_leaks(gemini_result[key], ticker_upper)
+        print(f"  New description: {hints['description'][:80]}...")
+        print(f"  Fun fact 1: {hints['funFact1'][:60]}...")
+        print(f"  Fun fact 2: {hints['funFact2'][:60]}...")
     else:
         print("  Description generation failed, keeping existing.")
+        ok = False
 
-    new_diff = generate_difficulty_gemini(ticker_upper, name, sector, industry)
-    puzzle["difficulty"] = new_diff
-    print(f"  Difficulty: {new_diff}/5")
+    # No key or a rate limit must not reset an existing rating to the default
+    new_diff = generate_difficulty_gemini(ticker_upper, name, sector, industry, default=None)
+    if new_diff is None:
+        print(f"  Difficulty rating failed, keeping {tail.get('difficulty')}")
+        ok = False
+    else:
+        tail["difficulty"] = new_diff
+        print(f"  Difficulty: {new_diff}/5")
 
-    with open(path, "w") as f:
-        json.dump(puzzle, f, indent=2, cls=SafeJSONEncoder)
+    patch_puzzle_tail(path, tail, offset)
     print(f"  Wrote {path}")
+    return ok
 
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
+def load_progress() -> set:
+    try:
+        with open(PROGRESS_PATH) as f:
+            return set(json.load(f))
+    except FileNotFoundError:
+        return set()
+
+
+def save_progress(done: set):
+    os.makedirs(os.path.dirname(PROGRESS_PATH), exist_ok=True)
+    with open(PROGRESS_PATH, "w") as f:
+        json.dump(sorted(done), f)
+
+
+def regen_bulk(where: list[str], concurrency: int, resume: bool, dry_run: bool, limit: int | None):
+    names = sorted(n for n in os.listdir(PUZZLES_DIR) if n.endswith(".json"))
+    selected = scan(names, where)
+    print(f"Selected {len(selected)} of {len(names)} puzzles")
+
+    done = load_progress() if resume else set()
+    pending = [(name, matched) for name, matched in selected if name not in done]
+    if done:
+        print(f"Resuming: {len(selected) - len(pending)} already regenerated")
+    if limit is not None:
+        pending = pending[:limit]
+
+    for name, matched in pending:
+        print(f"  {name[:-len('.json')].upper():<8}{', '.join(matched)}")
+    if dry_run or not pending:
+        return
+
+    save_progress(done)
+    failures = []
+
+    def work(item):
+        name, matched = item
+        try:
+            return name, regen(name[:-len(".json")], refresh_ipo="default-ipo" in matched)
+        except Exception as e:
+            print(f"  ERROR regenerating {name}: {e}")
+            return name, False
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for name, ok in pool.map(work, pending):
+            if ok:
+                done.add(name)
+                save_progress(done)
+            else:
+                failures.append(name)
+
+    print(f"\nRegenerated {len(pending) - len(failures)}/{len(pending)} puzzles")
+    if failures:
+        print(f"Failed (rerun with --resume): {' '.join(failures)}")
+        sys.exit(1)
+    if len(done) >= len(selected):
+        os.remove(PROGRESS_PATH)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate puzzle descriptions via Gemini.")
+    parser.add_argument("tickers", nargs="*", help="tickers to regenerate")
+    parser.add_argument("--where", action="append", default=[], choices=[*PREDICATES, "leaks"],
+                        help="select puzzles matching any of these predicates (repeatable)")
+    parser.add_argument("--dry-run", action="store_true", help="list the selection without regenerating")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"concurrent Gemini requests (default {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--resume", action="store_true", help="skip puzzles finished by an interrupted run")
+    parser.add_argument("--limit", type=int, help="regenerate at most this many puzzles")
+    args = parser.parse_args()
+
+    if args.where:
+        regen_bulk(args.where, args.concurrency, args.resume, args.dry_run, args.limit)
+    elif args.tickers:
+        failed = [ticker for ticker in args.tickers if not regen(ticker.lower())]
+        if failed:
+            print(f"Gemini failed for: {' '.join(failed)}")
+            sys.exit(1)
+    else:
         print("Usage: python3 scripts/regen_description.py TICKER")
+        print("       python3 scripts/regen_description.py --where PREDICATE [--dry-run]")
         sys.exit(1)
-    regen(sys.argv[1])
+
+
+if __name__ == "__main__":
+    main()
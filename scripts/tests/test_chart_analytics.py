@@ -0,0 +1,88 @@
+"""analytics_for() against a per-ticker pandas reference.
+
+fixtures/analytics_1y.json holds 1y daily charts taken from the corpus:
+AAPL, IBM, IBM with eleven rows dropped (gaps) and a 15-row chart too short
+for any hint. fixtures/benchmark_1y.json is the recorded benchmark.
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from chart_analytics import MIN_OBSERVATIONS, PRECISION, TRADING_DAYS, analytics_for, load_benchmark_file
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_charts():
+    with open(os.path.join(FIXTURES, "analytics_1y.json")) as f:
+        return json.load(f)
+
+
+def load_benchmark():
+    return load_benchmark_file(os.path.join(FIXTURES, "benchmark_1y.json"))
+
+
+def closes(chart):
+    rows = np.asarray(chart, dtype=float)
+    return pd.Series(1 + rows[:, 4] / 100, index=rows[:, 0].astype(np.int64) // 86400)
+
+
+def reference(chart, benchmark):
+    """The same hints computed one ticker at a time with pandas."""
+    close = closes(chart)
+    returns = close.pct_change().dropna()
+    bench = closes(benchmark).pct_change().dropna()
+    joined = pd.concat([returns, bench], axis=1, join="inner")
+    r, b = joined.iloc[:, 0], joined.iloc[:, 1]
+    return {
+        "volatility1y": np.log1p(returns).std(ddof=1) * np.sqrt(TRADING_DAYS) * 100,
+        "maxDrawdown1y": (close / close.cummax() - 1).min() * 100,
+        "beta1y": r.cov(b) / b.var(),
+        "correlation1y": r.corr(b),
+        "bestDay1y": returns.max() * 100,
+        "worstDay1y": returns.min() * 100,
+    }
+
+
+def test_matches_pandas_reference():
+    charts = load_charts()
+    benchmark = load_benchmark()
+    results = analytics_for(charts, benchmark)
+
+    for key in ("AAPL", "IBM", "IBM_GAPS"):
+        expected = reference(charts[key], benchmark)
+        assert set(results[key]) == set(expected)
+        for hint, value in expected.items():
+            assert results[key][hint] == round(value, PRECISION[hint]), (key, hint)
+
+
+def test_gaps_change_only_the_gapped_ticker():
+    charts = load_charts()
+    benchmark = load_benchmark()
+    together = analytics_for(charts, benchmark)
+    alone = analytics_for({"IBM": charts["IBM"]}, benchmark)
+    assert together["IBM"] == alone["IBM"]
+    assert together["IBM_GAPS"] != together["IBM"]
+
+
+def test_short_chart_has_no_hints():
+    charts = load_charts()
+    assert len(charts["SHORT"]) - 1 < MIN_OBSERVATIONS
+    assert analytics_for({"SHORT": charts["SHORT"]}, load_benchmark()) == {"SHORT": {}}
+
+
+def test_without_benchmark_skips_beta_and_correlation():
+    hints = analytics_for({"AAPL": load_charts()["AAPL"]}, [])["AAPL"]
+    assert "volatility1y" in hints
+    assert "beta1y" not in hints and "correlation1y" not in hints
+
+
+def test_no_data_at_all():
+    assert analytics_for({"X": []}, []) == {"X": {}}
+    assert analytics_for({}, []) == {}
+    assert analytics_for({"X": [[0, 0, 0, 0, 0]]}, []) == {"X": {}}
@@ -0,0 +1,87 @@
+"""encode_intraday() round trip against a recorded 5D/30m fixture.
+
+fixtures/intraday_5d_30m.json holds 30-minute bars in the shape yfinance
+returns for `period="5d", interval="30m"`: Thanksgiving week 2025, so it
+covers overnight gaps, the closed holiday, the 13:00 half-day on Nov 28, a
+weekend and one bar with a missing close.
+
+decode() mirrors decodeIntradayDelta() in src/lib/charts.ts.
+"""
+
+import json
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from generate_puzzles import encode_intraday
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "intraday_5d_30m.json")
+
+
+def load_fixture():
+    with open(FIXTURE) as f:
+        data = json.load(f)
+    frame = pd.DataFrame(data["bars"], columns=data["columns"], dtype=object)
+    index = pd.to_datetime(frame.pop("Datetime"), utc=True).dt.tz_convert("America/New_York")
+    return frame.set_index(index).astype(float)
+
+
+def decode(rows):
+    """Python port of decodeIntradayDelta (src/lib/charts.ts)."""
+    out = []
+    minutes = 0
+    prev_close = 0
+    for dt, o, h, l, c in rows:
+        minutes += dt
+        close = prev_close + c
+        out.append([minutes * 60, (prev_close + o) / 100, (prev_close + h) / 100, (prev_close + l) / 100, close / 100])
+        prev_close = close
+    return out
+
+
+def test_round_trip_matches_source():
+    hist = load_fixture()
+    rows, base_price = encode_intraday(hist)
+    source = hist.dropna(subset=["Close"])
+
+    assert base_price == source["Close"].iloc[0]
+    assert len(rows) == len(source)
+    assert all(isinstance(v, int) for row in rows for v in row)
+
+    first_ts = int(source.index[0].timestamp())
+    for decoded, (date, bar) in zip(decode(rows), source.iterrows()):
+        assert decoded[0] == int(date.timestamp()) - first_ts
+        for value, column in zip(decoded[1:], ("Open", "High", "Low", "Close")):
+            expected = (bar[column] - base_price) / base_price * 100
+            # Fixed point in hundredths of a percent, rounded once per value
+            assert abs(value - expected) <= 0.005 + 1e-9
+
+
+def test_gaps_and_half_day():
+    hist = load_fixture()
+    rows, _ = encode_intraday(hist)
+    source = hist.dropna(subset=["Close"])
+    steps = [row[0] for row in rows[1:]]
+    dates = [d.date().isoformat() for d in source.index]
+
+    # Within a session bars are 30 minutes apart, except across the dropped bar
+    assert steps.count(30) == len(steps) - 4 - 1
+    assert 60 in steps
+    # Last bar (15:30) to next open (09:30): overnight, over the holiday, over the weekend
+    overnight = 18 * 60
+    assert steps[dates.index("2025-11-26") - 1] == overnight
+    assert steps[dates.index("2025-11-28") - 1] == overnight + 24 * 60
+    assert steps[dates.index("2025-12-01") - 1] == 21 * 60 + 2 * 24 * 60
+    assert steps[dates.index("2025-12-02") - 1] == overnight
+    # The half-day ends with the 12:30 bar
+    assert dates.count("2025-11-28") == 7
+    assert source.index[dates.index("2025-12-01") - 1].strftime("%H:%M") == "12:30"
+
+
+def test_missing_close_is_dropped():
+    hist = load_fixture()
+    assert hist["Close"].isna().sum() == 1
+    rows, _ = encode_intraday(hist)
+    assert len(rows) == len(hist) - 1
@@ -16,6 +16,7 @@ import { ShareButton } from './components/ShareButton';
 import { StatsModal } from './components/StatsModal';
 import { OnboardingGuide } from './components/OnboardingGuide';
 import { useAuthStore } from './hooks/useAuth';
+import type { Timeframe } from './lib/types';
 
 function hasSeenOnboarding(): boolean {
   try { return localStorage.getItem('candle-onboarded') === '1'; } catch { return false; }
@@ -81,7 +82,7 @@ function App() {
   }
 
   const gameOver = state.won || state.lost;
-  const activeChartData = puzzle.charts[state.activeChart];
+  const activeChartData = puzzle.charts[state.activeChart] ?? puzzle.charts['1m'];
   const showPriceAxis = true;
   const puzzleNumber = getPuzzleNumber();
 
@@ -152,7 +153,7 @@ function App() {
                 showPriceAxis={showPriceAxis}
                 basePrice={puzzle.basePrices?.[state.activeChart] ?? puzzle.basePrice}
               />
-              <ChartTabs />
+              <ChartTabs available={Object.keys(puzzle.charts) as Timeframe[]} />
             </div>
 
             <Bankroll bankroll={state.bankroll} />
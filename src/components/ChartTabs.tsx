@@ -1,24 +1,31 @@
 import { useGameStore } from '../hooks/useGameState';
-
-type Timeframe = '1m' | '1y' | '5y' | '10y';
+import type { Timeframe } from '../lib/types';
 
 const TABS: { key: Timeframe; label: string }[] = [
+  { key: '1d', label: '1D' },
+  { key: '5d', label: '5D' },
   { key: '1m', label: '1M' },
   { key: '1y', label: '1Y' },
   { key: '5y', label: '5Y' },
   { key: '10y', label: 'ALL' },
 ];
 
-export function ChartTabs() {
+interface ChartTabsProps {
+  /** Timeframes present in the puzzle; older puzzles have no intraday charts */
+  available: Timeframe[];
+}
+
+export function ChartTabs({ available }: ChartTabsProps) {
   const { state, setActiveChart } = useGameStore();
   const { activeChart, revealedHints } = state;
 
   const gameOver = state.won || state.lost;
-  const isUnlocked = (key: Timeframe) => gameOver || key === '1m' || key === '1y' || revealedHints.includes(key);
+  const isUnlocked = (key: Timeframe) =>
+    gameOver || key === '1d' || key === '5d' || key === '1m' || key === '1y' || revealedHints.includes(key);
 
   return (
     <div className="flex gap-0 border border-terminal-border border-t-0 bg-terminal-dark">
-      {TABS.map(({ key, label }) => {
+      {TABS.filter(({ key }) => available.includes(key)).map(({ key, label }) => {
         const unlocked = isUnlocked(key);
         const active = activeChart === key;
 
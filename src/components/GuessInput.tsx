@@ -1,5 +1,5 @@
 import { useState, useRef, useEffect } from 'react';
-import tickers from '../data/tickers.json';
+import { searchTickers, findTicker } from '../lib/tickerIndex';
 
 interface GuessInputProps {
   onSubmit: (ticker: string) => void;
@@ -14,16 +14,7 @@ export function GuessInput({ onSubmit, disabled, previousGuesses }: GuessInputPr
   const inputRef = useRef<HTMLInputElement>(null);
   const dropdownRef = useRef<HTMLDivElement>(null);
 
-  const filtered = query.length > 0
-    ? tickers
-        .filter(
-          (t) =>
-            !previousGuesses.includes(t.ticker) &&
-            (t.ticker.toLowerCase().includes(query.toLowerCase()) ||
-              t.name.toLowerCase().includes(query.toLowerCase()))
-        )
-        .slice(0, 8)
-    : [];
+  const filtered = query.length > 0 ? searchTickers(query, previousGuesses, 8) : [];
 
   useEffect(() => {
     setSelectedIndex(0);
@@ -32,9 +23,7 @@ export function GuessInput({ onSubmit, disabled, previousGuesses }: GuessInputPr
   const handleSubmit = (ticker?: string) => {
     const value = ticker || (filtered.length > 0 ? filtered[selectedIndex]?.ticker : query);
     if (!value) return;
-    const match = tickers.find(
-      (t) => t.ticker.toLowerCase() === value.toLowerCase()
-    );
+    const match = findTicker(value);
     if (match) {
       onSubmit(match.ticker);
       setQuery('');
@@ -20,6 +20,9 @@ function formatHintValue(hint: HintDef, puzzle: PuzzleData): string {
     case 'funFact1': return h.funFact1 || 'No fun fact available';
     case 'funFact2': return h.funFact2 || 'No fun fact available';
     case 'high52w': return `H: $${h.high52w.toFixed(2)} / L: $${h.low52w.toFixed(2)}`;
+    case 'volatility1y': return `${h.volatility1y?.toFixed(1)}% / Max DD: ${h.maxDrawdown1y?.toFixed(1)}%`;
+    case 'beta1y': return `Beta: ${h.beta1y?.toFixed(2)} / Corr: ${h.correlation1y?.toFixed(2)}`;
+    case 'bestDay1y': return `Best: +${h.bestDay1y?.toFixed(2)}% / Worst: ${h.worstDay1y?.toFixed(2)}%`;
     case 'industry': return h.industry;
     case 'ipoYear': return String(h.ipoYear);
     case '1m': return 'Chart unlocked';
@@ -40,6 +43,9 @@ function getHintDescription(id: string): string {
     case 'marketCapRange': return 'Market capitalization size range';
     case 'industry': return 'Specific industry within the sector';
     case 'high52w': return '52-week high and low stock prices';
+    case 'volatility1y': return 'Annualized 1-year volatility and max drawdown';
+    case 'beta1y': return 'Beta and correlation to the market over 1 year';
+    case 'bestDay1y': return 'Biggest one-day gain and loss over 1 year';
     case 'description': return 'AI-generated company description with key names redacted';
     case '5y': return 'Unlock the 5-year price chart';
     case '10y': return 'Unlock the all-time price chart';
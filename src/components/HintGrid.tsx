@@ -13,7 +13,7 @@ interface HintGridProps {
 
 const CATEGORIES: { key: string; label: string; ids: string[] }[] = [
   { key: 'all', label: 'ALL', ids: [] },
-  { key: 'technical', label: 'TECHNICAL', ids: ['5y', '10y', 'high52w'] },
+  { key: 'technical', label: 'TECHNICAL', ids: ['5y', '10y', 'high52w', 'volatility1y', 'beta1y', 'bestDay1y'] },
   { key: 'fundamental', label: 'FUNDAMENTAL', ids: ['sector', 'industry', 'marketCapRange', 'ipoYear'] },
   { key: 'company', label: 'COMPANY', ids: ['hqCountry', 'description', 'funFact1', 'funFact2'] },
 ];
@@ -21,9 +21,13 @@ const CATEGORIES: { key: string; label: string; ids: string[] }[] = [
 export function HintGrid({ puzzle, revealedHints, bankroll, disabled, onBuyHint }: HintGridProps) {
   const [activeTab, setActiveTab] = useState('all');
 
+  const available = HINT_DEFINITIONS.filter(
+    (h) => !h.optional || puzzle.hints[h.id as keyof PuzzleData['hints']] !== undefined,
+  );
+
   const filtered = activeTab === 'all'
-    ? HINT_DEFINITIONS
-    : HINT_DEFINITIONS.filter((h) => {
+    ? available
+    : available.filter((h) => {
         const cat = CATEGORIES.find((c) => c.key === activeTab);
         return cat?.ids.includes(h.id);
       });
@@ -1,5 +1,5 @@
 import { create } from 'zustand';
-import type { GameState, Stats } from '../lib/types';
+import type { GameState, Stats, Timeframe } from '../lib/types';
 import { STARTING_BANKROLL, WRONG_GUESS_PENALTY, HINT_DEFINITIONS } from '../lib/scoring';
 import { submitGameResult } from '../lib/api';
 import { useAuthStore } from './useAuth';
@@ -77,7 +77,7 @@ interface GameStore {
   reset: (puzzleId: string) => void;
   buyHint: (hintId: string) => boolean;
   submitGuess: (ticker: string, correctTicker: string) => 'correct' | 'wrong' | 'lost';
-  setActiveChart: (chart: '1y' | '1m' | '5y' | '10y') => void;
+  setActiveChart: (chart: Timeframe) => void;
 }
 
 export const useGameStore = create<GameStore>((set, get) => ({
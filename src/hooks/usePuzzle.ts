@@ -1,5 +1,6 @@
 import { useState, useEffect, useCallback } from 'react';
 import type { PuzzleData } from '../lib/types';
+import { decodeCharts } from '../lib/charts';
 
 function getTodayDate(): string {
   const d = new Date();
@@ -27,7 +28,7 @@ export function usePuzzle() {
         return res.json();
       })
       .then((data: PuzzleData) => {
-        setPuzzle(data);
+        setPuzzle(decodeCharts(data));
         setLoading(false);
       })
       .catch((err) => {
@@ -58,7 +59,7 @@ export function usePuzzle() {
         return res.json();
       })
       .then((data: PuzzleData) => {
-        setPuzzle(data);
+        setPuzzle(decodeCharts(data));
         setLoading(false);
       })
       .catch((err) => {
@@ -0,0 +1,44 @@
+import type { PuzzleData, Timeframe } from './types';
+
+/**
+ * Decode an 'intraday-delta-v1' chart into [ts, open%, high%, low%, close%] rows.
+ *
+ * Encoded rows are [minutes since previous bar, open, high, low, close] where
+ * prices are integer hundredths of a percent relative to the previous bar's
+ * close (the first row is relative to the base price). Timestamps come back
+ * as seconds since the first bar.
+ */
+function decodeIntradayDelta(rows: number[][]): number[][] {
+  const out: number[][] = [];
+  let minutes = 0;
+  let prevClose = 0;
+  for (const [dt, o, h, l, c] of rows) {
+    minutes += dt;
+    const close = prevClose + c;
+    out.push([
+      minutes * 60,
+      (prevClose + o) / 100,
+      (prevClose + h) / 100,
+      (prevClose + l) / 100,
+      close / 100,
+    ]);
+    prevClose = close;
+  }
+  return out;
+}
+
+/** Expand compactly stored charts so every chart is plain [ts, o, h, l, c] rows. */
+export function decodeCharts(puzzle: PuzzleData): PuzzleData {
+  if (!puzzle.chartFormats) return puzzle;
+
+  const charts = { ...puzzle.charts };
+  for (const [key, format] of Object.entries(puzzle.chartFormats)) {
+    const tf = key as Timeframe;
+    const rows = charts[tf];
+    if (!rows) continue;
+    if (format === 'intraday-delta-v1') {
+      charts[tf] = decodeIntradayDelta(rows);
+    }
+  }
+  return { ...puzzle, charts, chartFormats: undefined };
+}
@@ -6,6 +6,8 @@ export interface HintDef {
   label: string;
   cost: number;
   type: 'text' | 'chart' | 'price';
+  /** Only offered when the puzzle has this hint (market-derived hints are optional). */
+  optional?: boolean;
 }
 
 export const HINT_DEFINITIONS: HintDef[] = [
@@ -14,7 +16,10 @@ export const HINT_DEFINITIONS: HintDef[] = [
   { id: 'ipoYear', label: 'IPO YEAR', cost: 50, type: 'text' },
   { id: 'funFact2', label: 'FUN FACT 2', cost: 60, type: 'text' },
   { id: 'sector', label: 'SECTOR', cost: 75, type: 'text' },
+  { id: 'bestDay1y', label: 'BEST/WORST DAY', cost: 80, type: 'text', optional: true },
+  { id: 'volatility1y', label: 'VOLATILITY', cost: 90, type: 'text', optional: true },
   { id: 'marketCapRange', label: 'MKT CAP', cost: 100, type: 'text' },
+  { id: 'beta1y', label: 'BETA', cost: 110, type: 'text', optional: true },
   { id: 'industry', label: 'INDUSTRY', cost: 125, type: 'text' },
   { id: 'high52w', label: '52W HIGH/LOW', cost: 150, type: 'text' },
   { id: 'description', label: 'DESCRIPTION', cost: 175, type: 'text' },
@@ -0,0 +1,97 @@
+import index from '../data/tickerIndex.json';
+
+/**
+ * Prefix index generated by scripts/build_ticker_index.py.
+ *
+ * `keys` is sorted (lowercased tickers and normalized name tokens) and
+ * `refs[i]` is the entry that key i belongs to, so every prefix query is a
+ * binary search to a contiguous range of keys.
+ */
+interface TickerIndex {
+  tickers: string[];
+  names: string[];
+  keys: string[];
+  refs: number[];
+  buckets: Record<string, [number, number]>;
+}
+
+export interface TickerEntry {
+  ticker: string;
+  name: string;
+}
+
+const idx = index as unknown as TickerIndex;
+
+function lowerBound(keys: string[], target: string, lo: number, hi: number): number {
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (keys[mid] < target) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+function prefixRange(prefix: string): [number, number] {
+  const bucket = idx.buckets[prefix[0]];
+  if (!bucket) return [0, 0];
+  const start = lowerBound(idx.keys, prefix, bucket[0], bucket[1]);
+  const end = lowerBound(idx.keys, prefix + '\uffff', start, bucket[1]);
+  return [start, end];
+}
+
+function refsFor(prefix: string): Set<number> {
+  const [start, end] = prefixRange(prefix);
+  return new Set(idx.refs.slice(start, end));
+}
+
+function normalize(text: string): string {
+  return text.normalize('NFKD').replace(/[\u0080-\uffff]/g, '').toLowerCase();
+}
+
+/** Share-class tickers appear as both BRK.B and BRK-B; treat them as one. */
+function canonical(ticker: string): string {
+  return ticker.trim().toLowerCase().replace(/\./g, '-');
+}
+
+/**
+ * Tickers whose symbol starts with the query, then companies where every
+ * query word prefixes a word of the name.
+ */
+export function searchTickers(query: string, exclude: string[] = [], limit = 8): TickerEntry[] {
+  const tokens = normalize(query).match(/[a-z0-9]+/g);
+  if (!tokens) return [];
+
+  const byTicker = refsFor(canonical(query));
+  let byName: Set<number> | null = null;
+  for (const token of tokens) {
+    const matched = refsFor(token);
+    byName = byName === null ? matched : new Set([...byName].filter((i) => matched.has(i)));
+  }
+
+  const ranked = [
+    ...[...byTicker].sort((a, b) => a - b),
+    ...[...(byName ?? [])].filter((i) => !byTicker.has(i)).sort((a, b) => a - b),
+  ];
+
+  const results: TickerEntry[] = [];
+  for (const i of ranked) {
+    if (exclude.includes(idx.tickers[i])) continue;
+    results.push({ ticker: idx.tickers[i], name: idx.names[i] });
+    if (results.length === limit) break;
+  }
+  return results;
+}
+
+/** Exact ticker lookup (case-insensitive, BRK.B == BRK-B). */
+export function findTicker(value: string): TickerEntry | undefined {
+  const target = canonical(value);
+  const [start, end] = prefixRange(target);
+  for (let k = start; k < end; k++) {
+    if (idx.keys[k] !== target) break;
+    const i = idx.refs[k];
+    if (canonical(idx.tickers[i]) === target) {
+      return { ticker: idx.tickers[i], name: idx.names[i] };
+    }
+  }
+  return undefined;
+}
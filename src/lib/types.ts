@@ -1,3 +1,8 @@
+export type Timeframe = '1d' | '5d' | '1m' | '1y' | '5y' | '10y';
+
+/** Compact storage formats for charts; charts not listed are plain daily rows. */
+export type ChartFormat = 'intraday-delta-v1';
+
 export interface PuzzleData {
   id: string;
   answer: {
@@ -8,11 +13,14 @@ export interface PuzzleData {
   basePrices?: Record<string, number>;
   difficulty?: number;
   charts: {
+    '1d'?: number[][];
+    '5d'?: number[][];
     '1y': number[][];
     '1m': number[][];
     '5y': number[][];
     '10y': number[][];
   };
+  chartFormats?: Partial<Record<Timeframe, ChartFormat>>;
   hints: {
     sector: string;
     industry: string;
@@ -24,6 +32,13 @@ export interface PuzzleData {
     high52w: number;
     low52w: number;
     ipoYear: number;
+    // Market-derived, from scripts/chart_analytics.py (absent on older puzzles)
+    volatility1y?: number;
+    maxDrawdown1y?: number;
+    beta1y?: number;
+    correlation1y?: number;
+    bestDay1y?: number;
+    worstDay1y?: number;
   };
 }
 
@@ -34,7 +49,7 @@ export interface GameState {
   guesses: string[];
   won: boolean;
   lost: boolean;
-  activeChart: '1y' | '1m' | '5y' | '10y';
+  activeChart: Timeframe;
 }
 
 export interface Stats {